@@ -0,0 +1,145 @@
+"""
+Cost of resolving dependencies inside one request scope: every
+interactor (``interactors``) and only the stateless repositories
+(``stateless``). Each figure is the best of several interleaved rounds.
+
+``request-scoped`` re-registers the stateless repositories with
+``Scope.REQUEST`` (the previous layout); ``app-scoped`` is the current
+``AppProvider``. Nothing connects to Postgres or Redis, but ``Config``
+is read from the environment like the app does.
+
+Usage:
+    python -m backend.benchmarks.container_resolution [requests]
+"""
+import asyncio
+import sys
+import time
+from typing import AsyncIterable
+
+from argon2 import PasswordHasher
+from dishka import AnyOf, Provider, Scope, make_async_container, provide
+from faststream.rabbit import RabbitBroker
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.src.application import interfaces
+from backend.src.application.interactors import (
+    GetUserInteractor,
+    LoginInteractor,
+    SignupInteractor,
+)
+from backend.src.config import Config
+from backend.src.infrastructure.factories.executor import (
+    BoundedExecutor,
+    new_hash_executor,
+)
+from backend.src.infrastructure.factories.postgres import new_engine
+from backend.src.infrastructure.factories.rabbit import new_broker
+from backend.src.infrastructure.factories.redis import (
+    MeteredConnectionPool,
+    new_redis_pool,
+)
+from backend.src.infrastructure.repositories.cookies import CookieRepo
+from backend.src.infrastructure.repositories.exc import ExceptionHandlersRepo
+from backend.src.infrastructure.repositories.security import (
+    PasswordRehasher,
+    SecurityRepo,
+    UserRepoFactory,
+)
+from backend.src.infrastructure.repositories.sessions import GuestSessionBackend
+from backend.src.ioc import AppProvider
+
+
+class RequestScopedRepos(Provider):
+    scope = Scope.REQUEST
+
+    cookie_repo = provide(
+        CookieRepo, provides=AnyOf[CookieRepo, interfaces.ICookieBackend]
+    )
+    error_handler_repo = provide(
+        ExceptionHandlersRepo, provides=interfaces.IErrorHandler
+    )
+    guest_session_backend = provide(
+        GuestSessionBackend, provides=interfaces.IGuestSessionBackend
+    )
+    security_repo = provide(SecurityRepo, provides=interfaces.ISecurity)
+
+    @provide
+    async def get_password_rehasher(
+        self,
+        security: interfaces.ISecurity,
+        open_user_repo: UserRepoFactory
+    ) -> AsyncIterable[interfaces.IPasswordRehasher]:
+        rehasher = PasswordRehasher(security, open_user_repo)
+        yield rehasher
+        await rehasher.close()
+
+
+_TARGETS = {
+    "interactors": (SignupInteractor, LoginInteractor, GetUserInteractor),
+    "stateless": (
+        interfaces.ICookieBackend,
+        interfaces.IErrorHandler,
+        interfaces.IGuestSessionBackend,
+        interfaces.ISecurity,
+    ),
+}
+
+
+async def _measure(
+    providers: list[Provider],
+    config: Config,
+    targets: tuple[type, ...],
+    total: int
+) -> float:
+    engine = new_engine(config.postgres)
+    redis_pool = new_redis_pool(config.redis)
+    hash_executor = new_hash_executor(config.secret)
+    container = make_async_container(
+        *providers,
+        context={
+            Config: config,
+            RabbitBroker: new_broker(config.rabbitmq),
+            PasswordHasher: PasswordHasher(),
+            BoundedExecutor: hash_executor,
+            MeteredConnectionPool: redis_pool,
+            AsyncEngine: engine,
+        }
+    )
+
+    async def request() -> None:
+        async with container() as request_container:
+            for target in targets:
+                await request_container.get(target)
+
+    for _ in range(200):
+        await request()
+    started = time.perf_counter()
+    for _ in range(total):
+        await request()
+    elapsed = time.perf_counter() - started
+    await container.close()
+    await redis_pool.aclose()
+    await engine.dispose()
+    hash_executor.shutdown()
+    return elapsed / total
+
+
+async def main(total: int, rounds: int = 5) -> None:
+    config = Config()
+    config.redis.session_cache_enabled = False
+    layouts = {
+        "request-scoped": lambda: [AppProvider(), RequestScopedRepos()],
+        "app-scoped": lambda: [AppProvider()],
+    }
+    for target_name, targets in _TARGETS.items():
+        best = {name: float("inf") for name in layouts}
+        for _ in range(rounds):
+            for name, providers in layouts.items():
+                per_request = await _measure(providers(), config, targets, total)
+                best[name] = min(best[name], per_request)
+        for name, per_request in best.items():
+            print(f"{target_name:<12} {name:<16} {per_request * 1e6:>8.1f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
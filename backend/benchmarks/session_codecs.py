@@ -0,0 +1,57 @@
+"""
+Encode/decode time and stored bytes per session for each session codec.
+
+``legacy-json`` is the previous ``json.dumps(asdict(data))`` path.
+
+Usage:
+    python -m backend.benchmarks.session_codecs [iterations]
+"""
+import json
+import sys
+import timeit
+from dataclasses import asdict
+
+from backend.src.config import RedisConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.codecs import new_session_serializer
+
+
+def _legacy_dumps(data: SessionData) -> bytes:
+    return json.dumps(asdict(data)).encode()
+
+
+def _legacy_loads(raw: bytes) -> SessionData:
+    return SessionData(**json.loads(raw))
+
+
+def main(iterations: int) -> None:
+    data = SessionData(user_id=123_456_789)
+    candidates = {"legacy-json": (_legacy_dumps, _legacy_loads)}
+    for name in ("json", "msgpack", "struct"):
+        config = RedisConfig(
+            REDIS_HOST="127.0.0.1",
+            REDIS_PORT=6379,
+            REDIS_SESSIONS_DB=0,
+            REDIS_PASSWORD="",
+            REDIS_SESSION_CODEC=name,
+        )
+        try:
+            serializer = new_session_serializer(config)
+        except RuntimeError as e:
+            print(f"{name:<12} skipped: {e}")
+            continue
+        candidates[name] = (serializer.dumps, serializer.loads)
+    print(f"{'codec':<12} {'encode ns':>10} {'decode ns':>10} {'bytes':>6}")
+    for name, (dumps, loads) in candidates.items():
+        raw = dumps(data)
+        assert loads(raw) == data
+        encode = timeit.timeit(lambda: dumps(data), number=iterations)
+        decode = timeit.timeit(lambda: loads(raw), number=iterations)
+        print(
+            f"{name:<12} {encode / iterations * 1e9:>10.0f} "
+            f"{decode / iterations * 1e9:>10.0f} {len(raw):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
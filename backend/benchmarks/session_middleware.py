@@ -0,0 +1,138 @@
+"""
+Requests/sec through ``create_fastapi_app`` with the session middleware.
+
+Drives the ASGI app in-process (no server, no HTTP client), so the
+numbers isolate routing + middleware overhead. Guest traffic never
+touches Redis; the Redis client is never connected.
+
+Usage:
+    python -m backend.benchmarks.session_middleware [requests]
+"""
+import asyncio
+import sys
+import time
+
+from dishka import AnyOf, Provider, Scope, make_async_container, provide
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from redis.asyncio import Redis
+
+from backend.src.application.interfaces import (
+    ICookieBackend,
+    IGuestSessionBackend,
+    ISessionBackend,
+)
+from backend.src.config import RedisConfig, TracingConfig
+from backend.src.domain.entities import SessionData
+from backend.src.fastapi_app import create_fastapi_app
+from backend.src.infrastructure.codecs import (
+    SessionSerializer,
+    new_session_serializer,
+)
+from backend.src.infrastructure.repositories.cookies import CookieRepo
+from backend.src.infrastructure.repositories.sessions import (
+    GuestSessionBackend,
+    RedisSessionBackend,
+)
+
+
+class BenchProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_redis_config(self) -> RedisConfig:
+        return RedisConfig(
+            REDIS_HOST="127.0.0.1",
+            REDIS_PORT=6379,
+            REDIS_SESSIONS_DB=0,
+            REDIS_PASSWORD="",
+        )
+
+    @provide
+    def get_tracing_config(self) -> TracingConfig:
+        return TracingConfig(TRACING_ENABLED=False)
+
+    @provide
+    def get_redis(self, config: RedisConfig) -> Redis:
+        return Redis(host=config.host, port=config.port)
+
+    @provide
+    def get_serializer(self, config: RedisConfig) -> SessionSerializer[SessionData]:
+        return new_session_serializer(config)
+
+    @provide
+    def get_session_backend(
+        self,
+        redis: Redis,
+        config: RedisConfig,
+        serializer: SessionSerializer[SessionData]
+    ) -> ISessionBackend:
+        return RedisSessionBackend(redis, config, serializer)
+
+    cookie_repo = provide(
+        CookieRepo, provides=AnyOf[CookieRepo, ICookieBackend]
+    )
+    guest_backend = provide(GuestSessionBackend, provides=IGuestSessionBackend)
+
+
+async def _ping() -> PlainTextResponse:
+    return PlainTextResponse("pong")
+
+
+async def _stream() -> StreamingResponse:
+    async def body():
+        for _ in range(8):
+            yield b"x" * 1024
+    return StreamingResponse(body())
+
+
+async def _request(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def main(total: int) -> None:
+    container = make_async_container(BenchProvider())
+    app = await create_fastapi_app(container, None)
+    app.add_api_route("/bench/ping", _ping)
+    app.add_api_route("/bench/stream", _stream)
+    for path in ("/bench/ping", "/bench/stream"):
+        for _ in range(200):
+            await _request(app, path)
+        started = time.perf_counter()
+        for _ in range(total):
+            await _request(app, path)
+        elapsed = time.perf_counter() - started
+        print(f"{path:<16} {total / elapsed:>10.0f} req/s")
+    await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
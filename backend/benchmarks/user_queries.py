@@ -0,0 +1,82 @@
+"""
+Rows/sec for user lookups: full ORM entity loads converted with the
+original per-instance ``to_domain`` introspection, the same loads
+converted through a cached ``Base.domain_plan``, and column-projected
+Core selects mapped straight onto the domain dataclasses.
+
+Runs against an in-memory SQLite database through a synchronous
+session, so it isolates row hydration and mapping cost from the
+network and the Postgres driver.
+
+Usage:
+    python -m backend.benchmarks.user_queries [rows]
+"""
+import sys
+import time
+from dataclasses import fields
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, object_mapper
+
+from backend.src.domain.entities import UserDm, UserPasswordDM
+from backend.src.infrastructure.models import Base, User, UserRole
+
+
+def _orm_path(session: Session, dataclass: type) -> list:
+    names = {field.name for field in fields(dataclass)}
+    users = session.execute(sa.select(User)).scalars().all()
+    session.expunge_all()
+    return [
+        dataclass(**{
+            attr.key: getattr(user, attr.key)
+            for attr in object_mapper(user).attrs
+            if attr.key in names
+        })
+        for user in users
+    ]
+
+
+def _plan_path(session: Session, dataclass: type) -> list:
+    users = session.execute(sa.select(User)).scalars().all()
+    session.expunge_all()
+    return User.to_domain_many(users, dataclass)
+
+
+def _projection_path(session: Session, dataclass: type) -> list:
+    projection = User.projection(dataclass)
+    return projection.map_all(session.execute(projection.select()))
+
+
+def main(rows: int) -> None:
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(sa.insert(User), [
+            {
+                "username": f"user{i}",
+                "hashed_password": "$argon2id$" + "x" * 80,
+                "salt": "0123456789abcdef",
+                "role": UserRole.USER,
+            }
+            for i in range(rows)
+        ])
+        session.commit()
+        for dataclass in (UserDm, UserPasswordDM):
+            for name, path in (
+                ("orm+to_domain", _orm_path),
+                ("orm+plan", _plan_path),
+                ("projection", _projection_path),
+            ):
+                path(session, dataclass)
+                started = time.perf_counter()
+                result = path(session, dataclass)
+                elapsed = time.perf_counter() - started
+                assert len(result) == rows
+                print(
+                    f"{dataclass.__name__:<15} {name:<14} "
+                    f"{rows / elapsed:>12.0f} rows/s"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
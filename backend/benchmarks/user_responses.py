@@ -0,0 +1,89 @@
+"""
+Per-request cost of returning a user from a route.
+
+``dict`` is the previous shape: the route copies ``UserDTO`` into a
+dict, FastAPI validates it against the inferred ``dict[str, int | str]``
+annotation and ``JSONResponse`` renders it. ``dto+orjson`` returns the
+dataclass itself against ``UserResponse`` and renders with
+``ORJSONResponse``. The difference between the two rows is the
+serialization saving; routing overhead is identical.
+
+Usage:
+    python -m backend.benchmarks.user_responses [requests]
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from backend.src.application.dto import UserDTO
+from backend.src.controllers.schemas import UserResponse
+
+_USER = UserDTO(id=123_456, username="benchmark-user")
+
+
+def _dict_app() -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/me/")
+    async def me() -> dict[str, int | str]:
+        return {"id": _USER.id, "username": _USER.username}
+
+    return app
+
+
+def _dto_app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/me/", response_model=UserResponse)
+    async def me() -> UserDTO:
+        return _USER
+
+    return app
+
+
+async def _request(app: FastAPI) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/me/",
+        "raw_path": b"/me/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body = b""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal body
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return body
+
+
+async def main(total: int) -> None:
+    for name, app in {"dict": _dict_app(), "dto+orjson": _dto_app()}.items():
+        print(f"{name:<12} body {(await _request(app)).decode()}")
+        for _ in range(500):
+            await _request(app)
+        started = time.perf_counter()
+        for _ in range(total):
+            await _request(app)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<12} {elapsed / total * 1e6:>8.1f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
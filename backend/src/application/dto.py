@@ -5,6 +5,7 @@ from dataclasses import dataclass
 class LoginDto:
     username: str
     password: str
+    client_ip: str | None = None
 
 
 @dataclass(slots=True, frozen=True)
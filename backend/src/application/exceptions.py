@@ -22,3 +22,16 @@ class InvalidPasswordException(DomainException):
 class UserAlreadyExistsError(DomainException):
     """Exception raised when a user with the given username already exists."""
     message: str = "A user with this username already exists in the system"
+
+
+@dataclass
+class ServiceOverloadedException(DomainException):
+    """Exception raised when a bounded worker pool rejects new work."""
+    message: str = "Service is temporarily overloaded"
+
+
+@dataclass
+class TooManyLoginAttemptsException(DomainException):
+    """Exception raised when login attempts exceed the throttle limits."""
+    message: str = "Too many login attempts"
+    retry_after: int = 0
@@ -6,14 +6,13 @@ from backend.src.application.dto import (
     UserDTO,
     UserSignupDTO,
 )
-from backend.src.application.exceptions import (
-    UserAlreadyExistsError,
-)
 from backend.src.application.interfaces import (
-    IErrorHandler,
+    ILoginThrottle,
+    IPasswordRehasher,
     ISecurity,
     ISession,
     IUser,
+    IUserReader,
 )
 from backend.src.domain.entities import (
     PasswordDM,
@@ -25,27 +24,35 @@ from backend.src.domain.entities import (
 class LoginInteractor:
     def __init__(
         self,
-        user_repo: IUser,
-        security_repo: ISecurity
+        user_repo: IUserReader,
+        security_repo: ISecurity,
+        throttle: ILoginThrottle,
+        rehasher: IPasswordRehasher
     ) -> None:
         self._user_repo = user_repo
         self._security_repo = security_repo
+        self._throttle = throttle
+        self._rehasher = rehasher
 
     async def __call__(self, dto: LoginDto) -> int:
+        await self._throttle.hit(dto.username, dto.client_ip)
         user_dm = await self._user_repo.get_password(dto.username)
         password_dm = PasswordDM(
             salt=user_dm.salt,
             password=dto.password,
             hashed_password=user_dm.hashed_password
         )
-        await self._security_repo.verify_password(password_dm)
+        async with self._throttle.verification():
+            needs_rehash = await self._security_repo.verify_password(password_dm)
+        if needs_rehash:
+            self._rehasher.schedule(user_dm.id, password_dm)
         return user_dm.id
 
 
 class GetUserInteractor:
     def __init__(
         self,
-        user_repo: IUser
+        user_repo: IUserReader
     ) -> None:
         self._user_repo = user_repo
 
@@ -59,33 +66,24 @@ class SignupInteractor:
         self,
         session: ISession,
         security: ISecurity,
-        user_repo: IUser,
-        exc_handler: IErrorHandler 
+        user_repo: IUser
     ) -> None:
         self._session = session
         self._security = security
         self._user_repo = user_repo
-        self._exc_handler = exc_handler
 
     async def __call__(self, dto: UserSignupDTO) -> UserDTO:
-        # sourcery skip: raise-from-previous-error
-        try:
-            password_input_model = SignupPasswordDM(
-                salt=secrets.token_hex(8),
-                password=dto.password
-            )
-            password_model = await self._security.hash_password(
-                model=password_input_model
-            )
-            await self._user_repo.signup(UserSignupDM(
-                username=dto.username,
-                hashed_password=password_model.hashed_password,
-                salt=password_model.salt
-            ))
-            await self._session.flush()
-            user = await self._user_repo.get_user_by_username(dto.username)
-            return UserDTO(**asdict(user))
-        except Exception as e:
-            raise self._exc_handler.handle_error(
-                e, UserAlreadyExistsError
-            )
+        password_input_model = SignupPasswordDM(
+            salt=secrets.token_hex(8),
+            password=dto.password
+        )
+        password_model = await self._security.hash_password(
+            model=password_input_model
+        )
+        user = await self._user_repo.signup(UserSignupDM(
+            username=dto.username,
+            hashed_password=password_model.hashed_password,
+            salt=password_model.salt
+        ))
+        await self._session.commit()
+        return UserDTO(id=user.id, username=user.username)
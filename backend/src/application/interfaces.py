@@ -1,4 +1,10 @@
-from typing import Generic, Protocol
+from typing import (
+    Any,
+    AsyncContextManager,
+    Generic,
+    Iterable,
+    Protocol,
+)
 from uuid import UUID
 
 from fastapi import Request, Response
@@ -42,8 +48,8 @@ class IUser(Protocol):
         """Retrieves the hashed password of a user by their username."""
         ...
 
-    async def signup(self, signup_dm: UserSignupDM) -> None:
-        """backends a new user."""
+    async def signup(self, signup_dm: UserSignupDM) -> UserDm:
+        """Registers a new user and returns the created record."""
         ...
 
     async def get_current_user(self, user_id: int) -> UserDm:
@@ -54,12 +60,31 @@ class IUser(Protocol):
         """Returns the current user's data by their Username."""
         ...
 
+    async def update_password(
+        self,
+        user_id: int,
+        old_hash: str,
+        new_hash: str
+    ) -> bool:
+        """
+        Replaces a user's password hash if it still equals `old_hash`,
+        returning whether it was replaced.
+        """
+        ...
+
+
+class IUserReader(IUser, Protocol):
+    """`IUser` served from a read replica, for query-only interactors."""
+
 
 class ISecurity(Protocol):
     """Interface for password security management."""
 
-    async def verify_password(self, model: PasswordDM) -> None:
-        """Verifies the correctness of a password."""
+    async def verify_password(self, model: PasswordDM) -> bool:
+        """
+        Verifies the correctness of a password and returns whether
+        its hash uses outdated parameters.
+        """
         ...
 
     async def hash_password(self, model: SignupPasswordDM) -> PasswordDM:
@@ -67,6 +92,32 @@ class ISecurity(Protocol):
         ...
 
 
+class IPasswordRehasher(Protocol):
+    """Interface for upgrading password hashes outside the request."""
+
+    def schedule(self, user_id: int, model: PasswordDM) -> None:
+        """Rehashes a verified password and stores it in the background."""
+        ...
+
+
+class ILoginThrottle(Protocol):
+    """Interface for limiting password verification attempts."""
+
+    async def hit(self, username: str, client_ip: str | None) -> None:
+        """
+        Records a login attempt, raising TooManyLoginAttemptsException
+        when the username or the client is over its limit.
+        """
+        ...
+
+    def verification(self) -> AsyncContextManager[None]:
+        """
+        Holds one in-flight verification slot, raising
+        ServiceOverloadedException when all slots are taken.
+        """
+        ...
+
+
 class IErrorHandler(Protocol, Generic[ExceptionType]):
     """Interface for error handling."""
 
@@ -81,22 +132,88 @@ class IErrorHandler(Protocol, Generic[ExceptionType]):
 
 class ISessionBackend(Protocol, Generic[SessionID, SessionModel]):
     """Abstract class that defines methods for interacting with session data."""
-    async def create(self, session_id: SessionID, data: SessionModel) -> None:
-        """Create a new session."""
+    def parse_cookie(self, value: str) -> SessionID | None:
+        """Turn an auth cookie value into a session ID, or None if invalid."""
+        ...
+
+    def cookie_value(self, session_id: SessionID) -> str:
+        """Value of the auth cookie that refers to a session."""
+        ...
+
+    async def create(
+        self,
+        session_id: SessionID,
+        data: SessionModel
+    ) -> SessionID:
+        """
+        Create a new session and return the ID it is stored under.
+        Backends that cannot store a session under the given ID
+        issue a new one.
+        """
         ...
 
     async def read(self, session_id: SessionID) -> SessionModel | None:
         """Read session data from the storage."""
         ...
 
-    async def update(self, session_id: SessionID, data: SessionModel) -> None:
-        """Update session data to the storage"""
+    async def update(
+        self,
+        session_id: SessionID,
+        data: SessionModel
+    ) -> SessionID:
+        """
+        Update session data to the storage and return the session ID,
+        which changes when the backend cannot update it in place.
+        """
+        ...
+
+    async def patch(self, session_id: SessionID, **fields: Any) -> SessionID:
+        """
+        Update individual fields of an existing session and return the
+        session ID, which changes when the backend re-issues it.
+        """
         ...
 
     async def delete(self, session_id: SessionID) -> None:
         """Remove session data from the storage."""
         ...
 
+    async def read_many(
+        self,
+        session_ids: Iterable[SessionID]
+    ) -> dict[SessionID, SessionModel]:
+        """Read several sessions at once, skipping missing ones."""
+        ...
+
+    async def delete_many(self, session_ids: Iterable[SessionID]) -> None:
+        """Remove several sessions at once."""
+        ...
+
+    async def revoke_user(self, user_id: int) -> list[SessionID]:
+        """Remove every session of a user and return their IDs."""
+        ...
+
+    async def promote(
+        self,
+        data: SessionModel,
+        guest_id: SessionID | None = None,
+        previous_id: SessionID | None = None
+    ) -> SessionID:
+        """
+        Atomically create a session under a new ID, merge the guest's
+        data into the user's data, and drop the guest data and the
+        previous session. Returns the new session ID.
+        """
+        ...
+
+    async def read_user_data(self, user_id: int) -> dict[str, Any]:
+        """Read the data carried over from a user's guest sessions."""
+        ...
+
+    async def update_user_data(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Merge fields into the user's data."""
+        ...
+
 
 class IGuestSessionBackend(Protocol, Generic[GuestSessionID, GuestSessionData]):
     """Abstract interface for managing guest sessions."""
@@ -113,17 +230,20 @@ class IGuestSessionBackend(Protocol, Generic[GuestSessionID, GuestSessionData]):
         """Deletes a guest session (clears cookies)."""
         ...
 
-    def update_guest_data(
+    async def update_guest_data(
         self, 
-        request: Request, 
-        response: Response, 
+        session_id: GuestSessionID,
         new_data: GuestSessionData
     ) -> None:
         """Updates guest data while preserving existing data."""
         ...
 
-    def get_guest_data(self, request: Request) -> GuestSessionData:
-        """Gets guest session data from cookies."""
+    async def get_guest_data(self, session_id: GuestSessionID) -> GuestSessionData:
+        """Gets the data stored for a guest session."""
+        ...
+
+    async def delete_guest_data(self, session_id: GuestSessionID) -> None:
+        """Removes the data stored for a guest session."""
         ...
 
 
@@ -1,5 +1,5 @@
 from os import environ
-from typing import Dict, Type, TypeVar
+from typing import Dict, Literal, Type, TypeVar
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -16,10 +16,35 @@ class SecretConfig(BaseModel):
     config_secret_key: str = Field(alias="APP_CONFIG_ENCRYPTION_KEY")
     log_level: str = Field(alias="APP_LOG_LEVEL", default="info")
     pepper: str = Field(alias="APP_PEPPER")
+    hash_executor: Literal["thread", "process"] = Field(
+        alias="APP_HASH_EXECUTOR", default="thread"
+    )
+    hash_workers: int = Field(alias="APP_HASH_WORKERS", default=4)
+    hash_queue_limit: int = Field(alias="APP_HASH_QUEUE_LIMIT", default=64)
+    argon2_time_cost: int = Field(alias="APP_ARGON2_TIME_COST", default=3)
+    argon2_memory_cost: int = Field(alias="APP_ARGON2_MEMORY_COST", default=65536)
+    argon2_parallelism: int = Field(alias="APP_ARGON2_PARALLELISM", default=4)
+    argon2_hash_len: int = Field(alias="APP_ARGON2_HASH_LEN", default=32)
+    argon2_salt_len: int = Field(alias="APP_ARGON2_SALT_LEN", default=16)
+    session_token_keys: list[str] = Field(
+        alias="APP_SESSION_TOKEN_KEYS", default_factory=list
+    )
+    session_token_encrypt: bool = Field(
+        alias="APP_SESSION_TOKEN_ENCRYPT", default=False
+    )
+    login_throttle_enabled: bool = Field(
+        alias="APP_LOGIN_THROTTLE_ENABLED", default=True
+    )
+    login_window: int = Field(alias="APP_LOGIN_WINDOW", default=60)
+    login_username_limit: int = Field(alias="APP_LOGIN_USERNAME_LIMIT", default=5)
+    login_ip_limit: int = Field(alias="APP_LOGIN_IP_LIMIT", default=20)
+    login_max_concurrency: int = Field(
+        alias="APP_LOGIN_MAX_CONCURRENCY", default=8
+    )
 
-    @field_validator("allowed_hosts", mode="before")
+    @field_validator("allowed_hosts", "session_token_keys", mode="before")
     @classmethod
-    def split_allowed_hosts(cls, value):
+    def split_comma_separated(cls, value):
         if isinstance(value, str):
             return [] if value == "" else value.split(",")
         return value
@@ -39,6 +64,32 @@ class PostgresConfig(BaseModel):
     login: str = Field(alias="POSTGRES_USER")
     password: str = Field(alias="POSTGRES_PASSWORD")
     database: str = Field(alias="POSTGRES_DB")
+    pool_size: int = Field(alias="POSTGRES_POOL_SIZE", default=15)
+    max_overflow: int = Field(alias="POSTGRES_MAX_OVERFLOW", default=15)
+    pool_timeout: float = Field(alias="POSTGRES_POOL_TIMEOUT", default=30.0)
+    pool_recycle: int = Field(alias="POSTGRES_POOL_RECYCLE", default=1800)
+    pool_pre_ping: bool = Field(alias="POSTGRES_POOL_PRE_PING", default=True)
+    connect_timeout: int = Field(alias="POSTGRES_CONNECT_TIMEOUT", default=5)
+    prepare_threshold: int = Field(alias="POSTGRES_PREPARE_THRESHOLD", default=5)
+    statement_timeout: int = Field(
+        alias="POSTGRES_STATEMENT_TIMEOUT_MS", default=30000
+    )
+    replicas: list[str] = Field(
+        alias="POSTGRES_REPLICA_DSNS", default_factory=list
+    )
+    replica_balancing: Literal["round_robin", "least_connections"] = Field(
+        alias="POSTGRES_REPLICA_BALANCING", default="round_robin"
+    )
+    replica_cooldown: float = Field(
+        alias="POSTGRES_REPLICA_COOLDOWN", default=10.0
+    )
+
+    @field_validator("replicas", mode="before")
+    @classmethod
+    def split_comma_separated(cls, value):
+        if isinstance(value, str):
+            return [] if value == "" else value.split(",")
+        return value
 
 
 class RedisConfig(BaseModel):
@@ -46,6 +97,97 @@ class RedisConfig(BaseModel):
     port: int = Field(alias="REDIS_PORT")
     db: int = Field(alias="REDIS_SESSIONS_DB")
     password: str = Field(alias="REDIS_PASSWORD")
+    max_connections: int = Field(alias="REDIS_MAX_CONNECTIONS", default=50)
+    pool_timeout: float = Field(alias="REDIS_POOL_TIMEOUT", default=5.0)
+    socket_timeout: float = Field(alias="REDIS_SOCKET_TIMEOUT", default=2.0)
+    socket_connect_timeout: float = Field(
+        alias="REDIS_SOCKET_CONNECT_TIMEOUT", default=2.0
+    )
+    socket_keepalive: bool = Field(alias="REDIS_SOCKET_KEEPALIVE", default=True)
+    health_check_interval: int = Field(
+        alias="REDIS_HEALTH_CHECK_INTERVAL", default=30
+    )
+    session_sliding: bool = Field(alias="REDIS_SESSION_SLIDING", default=True)
+    session_idle_ttl: int = Field(alias="REDIS_SESSION_IDLE_TTL", default=3600)
+    session_absolute_ttl: int = Field(
+        alias="REDIS_SESSION_ABSOLUTE_TTL", default=86400
+    )
+    session_refresh_interval: int = Field(
+        alias="REDIS_SESSION_REFRESH_INTERVAL", default=60
+    )
+    session_storage: Literal["string", "hash", "signed"] = Field(
+        alias="REDIS_SESSION_STORAGE", default="string"
+    )
+    session_codec: Literal["json", "msgpack", "struct"] = Field(
+        alias="REDIS_SESSION_CODEC", default="json"
+    )
+    session_cache_enabled: bool = Field(
+        alias="REDIS_SESSION_CACHE_ENABLED", default=False
+    )
+    session_cache_ttl: float = Field(alias="REDIS_SESSION_CACHE_TTL", default=5.0)
+    session_cache_max_entries: int = Field(
+        alias="REDIS_SESSION_CACHE_MAX_ENTRIES", default=10_000
+    )
+    session_cache_max_bytes: int = Field(
+        alias="REDIS_SESSION_CACHE_MAX_BYTES", default=16 * 1024 * 1024
+    )
+    guest_data_ttl: int = Field(alias="REDIS_GUEST_DATA_TTL", default=1800)
+    session_revocation_refresh: float = Field(
+        alias="REDIS_SESSION_REVOCATION_REFRESH", default=5.0
+    )
+    session_revocation_capacity: int = Field(
+        alias="REDIS_SESSION_REVOCATION_CAPACITY", default=100_000
+    )
+    session_revocation_fp_rate: float = Field(
+        alias="REDIS_SESSION_REVOCATION_FP_RATE", default=0.001
+    )
+    session_shards: list[str] = Field(
+        alias="REDIS_SESSION_SHARDS", default_factory=list
+    )
+    session_previous_shards: list[str] = Field(
+        alias="REDIS_SESSION_PREVIOUS_SHARDS", default_factory=list
+    )
+    session_shard_vnodes: int = Field(
+        alias="REDIS_SESSION_SHARD_VNODES", default=160
+    )
+    session_migration_batch: int = Field(
+        alias="REDIS_SESSION_MIGRATION_BATCH", default=500
+    )
+    session_migration_interval: float = Field(
+        alias="REDIS_SESSION_MIGRATION_INTERVAL", default=0.5
+    )
+    session_excluded_paths: list[str] = Field(
+        alias="REDIS_SESSION_EXCLUDED_PATHS",
+        default_factory=lambda: [
+            "/health", "/metrics", "/static/", "/favicon.ico", "/robots.txt"
+        ]
+    )
+
+    @field_validator(
+        "session_excluded_paths",
+        "session_shards",
+        "session_previous_shards",
+        mode="before"
+    )
+    @classmethod
+    def split_comma_separated(cls, value):
+        if isinstance(value, str):
+            return [] if value == "" else value.split(",")
+        return value
+
+
+class CacheConfig(BaseModel):
+    user_enabled: bool = Field(alias="CACHE_USER_ENABLED", default=True)
+    user_ttl: float = Field(alias="CACHE_USER_TTL", default=30.0)
+    user_max_entries: int = Field(alias="CACHE_USER_MAX_ENTRIES", default=10_000)
+    user_redis_enabled: bool = Field(
+        alias="CACHE_USER_REDIS_ENABLED", default=False
+    )
+    user_redis_ttl: int = Field(alias="CACHE_USER_REDIS_TTL", default=300)
+
+
+class TracingConfig(BaseModel):
+    enabled: bool = Field(alias="TRACING_ENABLED", default=False)
 
 
 class Config(BaseModel):
@@ -61,3 +203,9 @@ class Config(BaseModel):
     redis: RedisConfig = Field(default_factory=lambda: load_config(
         RedisConfig
     ))
+    cache: CacheConfig = Field(default_factory=lambda: load_config(
+        CacheConfig
+    ))
+    tracing: TracingConfig = Field(default_factory=lambda: load_config(
+        TracingConfig
+    ))
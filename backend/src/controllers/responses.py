@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi import responses
+
+from backend.src.infrastructure.tracing import span
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """`ORJSONResponse` that reports rendering as a `serialize` span."""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return super().render(content)
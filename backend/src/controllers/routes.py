@@ -2,9 +2,11 @@
 from dishka.integrations.fastapi import FromDishka, inject
 from fastapi import APIRouter, HTTPException, Request
 
-from backend.src.application.dto import LoginDto, UserSignupDTO
+from backend.src.application.dto import LoginDto, UserDTO, UserSignupDTO
 from backend.src.application.exceptions import (
     InvalidPasswordException,
+    ServiceOverloadedException,
+    TooManyLoginAttemptsException,
     UserAlreadyExistsError,
     UserNotFoundException,
 )
@@ -14,48 +16,69 @@ from backend.src.application.interactors import (
     SignupInteractor,
 )
 from backend.src.controllers.schemas import (
+    MessageResponse,
     UserLoginRequest,
+    UserResponse,
     UserSignupRequest,
 )
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.middlewares import skip_session
 
 router = APIRouter()
 
 
 class UserRoutes:
-    @router.post("/login/")
+    @staticmethod
+    @router.post("/login/", response_model=MessageResponse)
     @inject
     async def login(
-        self, 
         request_body: UserLoginRequest,
-        request: FromDishka[Request],
+        request: Request,
         interactor: FromDishka[LoginInteractor]
-    ) -> dict[str, str]:
-        dto = LoginDto(**request_body.model_dump())
+    ) -> MessageResponse:
+        dto = LoginDto(
+            **request_body.model_dump(),
+            client_ip=request.client.host if request.client else None
+        )
         try:
             user_id = await interactor(dto)
         except UserNotFoundException as e:
             raise HTTPException(status_code=404, detail="User not found") from e
         except InvalidPasswordException as e:
             raise HTTPException(status_code=401, detail="Invalid password") from e
-        request.session["user_id"] = user_id
-        return {"message": "Logged in successfully"}
+        except TooManyLoginAttemptsException as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many login attempts",
+                headers={"Retry-After": str(e.retry_after)}
+            ) from e
+        except ServiceOverloadedException as e:
+            raise HTTPException(
+                status_code=503, detail="Service is temporarily overloaded"
+            ) from e
+        await request.state.session.promote(
+            SessionData(user_id=user_id),
+            guest_id=request.state.guest.session_id
+        )
+        return MessageResponse(message="Logged in successfully")
 
-    @router.get("/logout/")
+    @staticmethod
+    @router.get("/logout/", response_model=MessageResponse)
     @inject
     async def logout(
-        self, 
-        request: FromDishka[Request],
-    ) -> dict[str, str]:
-        request.session.clear()
-        return {"message": "Logged out successfully"}
+        request: Request,
+    ) -> MessageResponse:
+        await request.state.session.clear()
+        return MessageResponse(message="Logged out successfully")
 
-    @router.post("/signup")
+    @staticmethod
+    @router.post("/signup", response_model=UserResponse)
+    @skip_session
     @inject
     async def create_user(
-        self,
         request_body: UserSignupRequest,
         interactor: FromDishka[SignupInteractor]
-    ) -> dict[str, int | str]:
+    ) -> UserDTO:
         dto = UserSignupDTO(**request_body.model_dump())
         try:
             user = await interactor(dto)
@@ -63,20 +86,24 @@ class UserRoutes:
             raise HTTPException(
                 status_code=409, detail="User with this username already exists."
             ) from e
-        return {"id": user.id, "username": user.username}
+        except ServiceOverloadedException as e:
+            raise HTTPException(
+                status_code=503, detail="Service is temporarily overloaded"
+            ) from e
+        return user
 
-    @router.get("/me/")
+    @staticmethod
+    @router.get("/me/", response_model=UserResponse)
     @inject
     async def get_current_user(
-        self, 
-        request: FromDishka[Request],
+        request: Request,
         interactor: FromDishka[GetUserInteractor]
-    ) -> dict[str, int | str]:
-        user_id: int | None = request.session.get("user_id")
+    ) -> UserDTO:
+        session = await request.state.session.load()
+        user_id: int | None = session.user_id if session else None
         if not user_id:
             raise HTTPException(status_code=401, detail="Not authenticated")
         try:
-            user = await interactor(user_id)
+            return await interactor(user_id)
         except UserNotFoundException as e:
-            raise HTTPException(status_code=404, detail="User not found") from e
-        return {"id": user.id, "username": user.username}
\ No newline at end of file
+            raise HTTPException(status_code=404, detail="User not found") from e
\ No newline at end of file
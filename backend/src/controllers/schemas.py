@@ -64,4 +64,13 @@ class UserSignupRequest(UserLoginRequest):
                 uppercase letter, one digit, and 
                 one special character
             """)
-        return value
\ No newline at end of file
+        return value
+
+
+class UserResponse(BaseModel):
+    id: int
+    username: str
+
+
+class MessageResponse(BaseModel):
+    message: str
@@ -4,11 +4,17 @@ from dishka import AsyncContainer
 from dishka.integrations import fastapi as fastapi_integration
 from fastapi import FastAPI
 
+from backend.src.application.interfaces import (
+    ICookieBackend,
+    IGuestSessionBackend,
+    ISessionBackend,
+)
+from backend.src.config import RedisConfig, TracingConfig
+from backend.src.controllers.responses import ORJSONResponse
 from backend.src.controllers.routes import router
-from backend.src.infrastructure.middlewares import SessionMiddleware
-from backend.src.infrastructure.repositories.sessions import (
-    GuestSessionBackend,
-    RedisSessionBackend,
+from backend.src.infrastructure.middlewares import (
+    SessionMiddleware,
+    TracingMiddleware,
 )
 
 
@@ -19,15 +25,26 @@ async def create_fastapi_app(
         AsyncContextManager[Mapping[str, Any]]
     ] | None
 ) -> FastAPI:
-    fastapi_app = FastAPI(lifespan=lifespan)
+    fastapi_app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
+    )
     async with container() as opened:
-        redis_backend = await opened.get(RedisSessionBackend)
-        guest_backend = await opened.get(GuestSessionBackend)
+        tracing_config = await opened.get(TracingConfig)
+        redis_config = await opened.get(RedisConfig)
+        redis_backend = await opened.get(ISessionBackend)
+        guest_backend = await opened.get(IGuestSessionBackend)
+        cookie_backend = await opened.get(ICookieBackend)
     fastapi_app.include_router(router)
     fastapi_app.add_middleware(
         SessionMiddleware,
         redis_manager=redis_backend,
-        guest_manager=guest_backend
+        guest_manager=guest_backend,
+        cookie_manager=cookie_backend,
+        cookie_max_age=redis_config.session_absolute_ttl,
+        excluded_paths=redis_config.session_excluded_paths
     )
+    if tracing_config.enabled:
+        fastapi_app.add_middleware(TracingMiddleware)
     fastapi_integration.setup_dishka(container=container, app=fastapi_app)
     return fastapi_app
\ No newline at end of file
@@ -1,11 +1,14 @@
 from dataclasses import is_dataclass
-from typing import Awaitable, Callable, Protocol, TypeVar
+from typing import TYPE_CHECKING, Awaitable, Callable, Protocol, TypeVar
 from uuid import UUID
 
 from fastapi import Request, Response
 
 from backend.src.application.exceptions import DomainException
 
+if TYPE_CHECKING:
+    from _typeshed import DataclassInstance
+
 
 class DataclassProtocol(Protocol):
     """A protocol enforcing that subclasses must be dataclasses.
@@ -39,15 +42,15 @@ class DataclassProtocol(Protocol):
             raise TypeError(f"{cls.__name__} must be dataclass!")
 
 
-SessionModel = TypeVar("SessionModel", bound=DataclassProtocol)
-SessionID = TypeVar("SessionID", bound=UUID, contravariant=True)
+SessionModel = TypeVar("SessionModel", bound="DataclassInstance")
+SessionID = TypeVar("SessionID", bound=UUID)
 
-GuestSessionID = TypeVar("GuestSessionID", bound=UUID, covariant=True)
+GuestSessionID = TypeVar("GuestSessionID", bound=UUID)
 GuestSessionData = TypeVar("GuestSessionData", bound=DataclassProtocol)
 
 RequestResponseEndpoint = Callable[[Request], Awaitable[Response]]
 
-DomainModel = TypeVar("DomainModel", bound=DataclassProtocol)
+DomainModel = TypeVar("DomainModel", bound="DataclassInstance")
 DtoModel = TypeVar("DtoModel", bound=DataclassProtocol)
 
 ExceptionType = TypeVar("ExceptionType", bound=BaseException)
@@ -0,0 +1,298 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import struct
+from dataclasses import fields
+from typing import Generic, Optional, Protocol
+from uuid import UUID
+
+from backend.src.config import RedisConfig, SecretConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure._types import SessionModel
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+AESGCM: Optional[type["_AESGCM"]]
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import (  # type: ignore[import-not-found,unused-ignore]
+        AESGCM as _AESGCM,
+    )
+    AESGCM = _AESGCM
+except ImportError:  # pragma: no cover - optional dependency
+    AESGCM = None
+
+
+class ISessionCodec(Protocol, Generic[SessionModel]):
+    """Serializes session models to bytes and back."""
+
+    version: int
+
+    def encode(self, data: SessionModel) -> bytes:
+        """Encodes a session model without the version byte."""
+        ...
+
+    def decode(self, payload: bytes) -> SessionModel:
+        """Decodes a payload produced by `encode`."""
+        ...
+
+
+class JsonSessionCodec(ISessionCodec[SessionModel]):
+    """JSON object keyed by field name."""
+
+    version = 1
+
+    def __init__(self, model: type[SessionModel]) -> None:
+        self._model = model
+        self._fields = tuple(field.name for field in fields(model))
+
+    def encode(self, data: SessionModel) -> bytes:
+        return json.dumps(
+            {name: getattr(data, name) for name in self._fields},
+            separators=(",", ":")
+        ).encode()
+
+    def decode(self, payload: bytes) -> SessionModel:
+        return self._model(**json.loads(payload))
+
+
+class MsgpackSessionCodec(ISessionCodec[SessionModel]):
+    """Msgpack array of field values in declaration order."""
+
+    version = 2
+
+    def __init__(self, model: type[SessionModel]) -> None:
+        self._model = model
+        self._fields = tuple(field.name for field in fields(model))
+
+    def encode(self, data: SessionModel) -> bytes:
+        return msgpack.packb([getattr(data, name) for name in self._fields])
+
+    def decode(self, payload: bytes) -> SessionModel:
+        return self._model(*msgpack.unpackb(payload))
+
+
+class StructSessionCodec(ISessionCodec[SessionModel]):
+    """
+    Fixed binary layout. The format string must be changed
+    together with `version` whenever the model gains fields.
+    """
+
+    version = 3
+
+    def __init__(self, model: type[SessionModel], layout: str) -> None:
+        self._model = model
+        self._fields = tuple(field.name for field in fields(model))
+        self._struct = struct.Struct(layout)
+
+    def encode(self, data: SessionModel) -> bytes:
+        return self._struct.pack(*(getattr(data, name) for name in self._fields))
+
+    def decode(self, payload: bytes) -> SessionModel:
+        return self._model(*self._struct.unpack(payload))
+
+
+class SessionSerializer(Generic[SessionModel]):
+    """
+    Writes sessions with one codec and prefixes them with its version
+    byte; reads any known version plus legacy unversioned JSON.
+    """
+
+    def __init__(
+        self,
+        model: type[SessionModel],
+        writer: ISessionCodec[SessionModel],
+        readers: list[ISessionCodec[SessionModel]]
+    ) -> None:
+        self._model = model
+        self._writer = writer
+        self._prefix = bytes([writer.version])
+        self._readers = {codec.version: codec for codec in [writer, *readers]}
+
+    def dumps(self, data: SessionModel) -> bytes:
+        return self._prefix + self._writer.encode(data)
+
+    def loads(self, raw: bytes) -> SessionModel:
+        """Decodes a stored session, raising ValueError if it cannot."""
+        if raw[:1] == b"{":
+            return self._model(**json.loads(raw))
+        try:
+            codec = self._readers[raw[0]]
+        except KeyError as e:
+            raise ValueError(f"Unknown session codec version {raw[0]}") from e
+        return codec.decode(raw[1:])
+
+    def try_loads(self, raw: bytes) -> Optional[SessionModel]:
+        """
+        Like `loads`, but returns None for values this host cannot
+        decode, such as msgpack sessions without msgpack installed.
+        """
+        try:
+            return self.loads(raw)
+        except (ValueError, TypeError, IndexError, struct.error):
+            return None
+
+
+_SESSION_STRUCT_LAYOUT = ">q"
+
+
+def new_session_serializer(
+    redis_config: RedisConfig
+) -> SessionSerializer[SessionData]:
+    codecs: dict[str, ISessionCodec[SessionData]] = {
+        "json": JsonSessionCodec(SessionData),
+        "struct": StructSessionCodec(SessionData, _SESSION_STRUCT_LAYOUT),
+    }
+    if msgpack is not None:
+        codecs["msgpack"] = MsgpackSessionCodec(SessionData)
+    elif redis_config.session_codec == "msgpack":
+        raise RuntimeError("msgpack session codec requires the 'msgpack' package")
+    return SessionSerializer(
+        model=SessionData,
+        writer=codecs[redis_config.session_codec],
+        readers=list(codecs.values()),
+    )
+
+
+class SignedSessionID(UUID, Generic[SessionModel]):
+    """Session ID decoded from a token, carrying the session it signs."""
+
+    __slots__ = ("data", "created")
+
+    data: SessionModel
+    created: int
+
+    def __init__(self, session_id: UUID, data: SessionModel, created: int) -> None:
+        super().__init__(int=session_id.int)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "created", created)
+
+
+class SessionTokenCodec(Generic[SessionModel]):
+    """
+    Packs a session into a URL-safe cookie token:
+    version | key id | session UUID | created | payload, followed by a
+    truncated HMAC-SHA256 tag, or AES-GCM encrypted when enabled.
+    Tokens are issued with the first key and accepted with any key,
+    so keys can be rotated by prepending a new one.
+    """
+
+    _SIGNED = 1
+    _ENCRYPTED = 2
+    _HEADER = struct.Struct(">BB")
+    _BODY = struct.Struct(">16sI")
+    _TAG_SIZE = 16
+    _NONCE_SIZE = 12
+
+    def __init__(
+        self,
+        serializer: SessionSerializer[SessionModel],
+        secrets: list[str],
+        encrypt: bool
+    ) -> None:
+        if not secrets:
+            raise ValueError("At least one session token key is required")
+        if encrypt and AESGCM is None:
+            raise RuntimeError(
+                "Encrypted session tokens require the 'cryptography' package"
+            )
+        self._serializer = serializer
+        self._version = self._ENCRYPTED if encrypt else self._SIGNED
+        self._keys: dict[int, list[bytes]] = {}
+        for secret in secrets:
+            self._keys.setdefault(self._key_id(secret), []).append(
+                self._derive(secret)
+            )
+        self._key_id_current = self._key_id(secrets[0])
+        self._key_current = self._derive(secrets[0])
+
+    def encode(self, session: SignedSessionID[SessionModel]) -> str:
+        header = self._HEADER.pack(self._version, self._key_id_current)
+        body = self._BODY.pack(session.bytes, session.created) + (
+            self._serializer.dumps(session.data)
+        )
+        if self._version == self._ENCRYPTED:
+            nonce = os.urandom(self._NONCE_SIZE)
+            token = header + nonce + self._cipher(self._key_current).encrypt(
+                nonce, body, header
+            )
+        else:
+            token = header + body + self._sign(self._key_current, header + body)
+        return base64.urlsafe_b64encode(token).rstrip(b"=").decode()
+
+    def decode(self, value: str) -> Optional[SignedSessionID[SessionModel]]:
+        """Returns the session of a valid token, or None."""
+        try:
+            token = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        except (binascii.Error, ValueError):
+            return None
+        if len(token) < self._HEADER.size:
+            return None
+        version, key_id = self._HEADER.unpack_from(token)
+        if version != self._version:
+            return None
+        header = token[:self._HEADER.size]
+        for key in self._keys.get(key_id, ()):
+            if (body := self._open(key, header, token)) is not None:
+                break
+        else:
+            return None
+        if len(body) <= self._BODY.size:
+            return None
+        raw_id, created = self._BODY.unpack_from(body)
+        data = self._serializer.try_loads(body[self._BODY.size:])
+        if data is None:
+            return None
+        return SignedSessionID(UUID(bytes=raw_id), data, created)
+
+    @staticmethod
+    def _cipher(key: bytes) -> "_AESGCM":
+        if AESGCM is None:
+            raise RuntimeError(
+                "Encrypted session tokens require the 'cryptography' package"
+            )
+        return AESGCM(key)
+
+    def _open(self, key: bytes, header: bytes, token: bytes) -> Optional[bytes]:
+        if self._version == self._ENCRYPTED:
+            nonce_end = self._HEADER.size + self._NONCE_SIZE
+            try:
+                return self._cipher(key).decrypt(
+                    token[self._HEADER.size:nonce_end], token[nonce_end:], header
+                )
+            except Exception:
+                return None
+        signed, tag = token[:-self._TAG_SIZE], token[-self._TAG_SIZE:]
+        if hmac.compare_digest(self._sign(key, signed), tag):
+            return signed[self._HEADER.size:]
+        return None
+
+    def _sign(self, key: bytes, message: bytes) -> bytes:
+        return hmac.new(key, message, hashlib.sha256).digest()[:self._TAG_SIZE]
+
+    @staticmethod
+    def _derive(secret: str) -> bytes:
+        return hmac.new(secret.encode(), b"session-token", hashlib.sha256).digest()
+
+    @staticmethod
+    def _key_id(secret: str) -> int:
+        return hmac.new(secret.encode(), b"key-id", hashlib.sha256).digest()[0]
+
+
+def new_session_token_codec(
+    secret_config: SecretConfig,
+    redis_config: RedisConfig
+) -> SessionTokenCodec[SessionData]:
+    return SessionTokenCodec(
+        serializer=new_session_serializer(redis_config),
+        secrets=(
+            secret_config.session_token_keys
+            or [secret_config.config_secret_key]
+        ),
+        encrypt=secret_config.session_token_encrypt,
+    )
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from backend.src.application.exceptions import ServiceOverloadedException
+from backend.src.config import SecretConfig
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True, frozen=True)
+class ExecutorStats:
+    workers: int
+    queue_limit: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_latency: float
+    max_latency: float
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables on a worker pool and rejects
+    new work once the number of pending calls hits the limit.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        workers: int,
+        queue_limit: int
+    ) -> None:
+        self._executor = executor
+        self._workers = workers
+        self._queue_limit = queue_limit
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Executes ``func`` in the pool, raising
+        ServiceOverloadedException when the queue is full.
+        """
+        if self._pending >= self._queue_limit:
+            self._rejected += 1
+            raise ServiceOverloadedException()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(func, *args, **kwargs)
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            self._pending -= 1
+            self._completed += 1
+            self._total_latency += elapsed
+            self._max_latency = max(self._max_latency, elapsed)
+
+    def stats(self) -> ExecutorStats:
+        """Returns queue depth and latency counters."""
+        return ExecutorStats(
+            workers=self._workers,
+            queue_limit=self._queue_limit,
+            queue_depth=self._pending,
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_latency=(
+                self._total_latency / self._completed if self._completed else 0.0
+            ),
+            max_latency=self._max_latency,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def new_hash_executor(secret_config: SecretConfig) -> BoundedExecutor:
+    executor: Executor
+    if secret_config.hash_executor == "process":
+        executor = ProcessPoolExecutor(max_workers=secret_config.hash_workers)
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=secret_config.hash_workers,
+            thread_name_prefix="argon2"
+        )
+    return BoundedExecutor(
+        executor=executor,
+        workers=secret_config.hash_workers,
+        queue_limit=secret_config.hash_queue_limit,
+    )
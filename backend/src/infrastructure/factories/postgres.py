@@ -1,11 +1,98 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import itertools
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import NewType, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from backend.src.config import PostgresConfig
 
 
-def new_session_maker(psql_config: PostgresConfig) -> async_sessionmaker[AsyncSession]:
+@dataclass(slots=True, frozen=True)
+class PostgresPoolStats:
+    size: int
+    checked_out: int
+    overflow: int
+    connects: int
+    checkouts: int
+    timeouts: int
+    avg_wait: float
+    max_wait: float
+
+
+class PoolMetrics:
+    """Counters fed by pool events and by the metered pool."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waited = 0
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def on_checkout(
+        self, dbapi_connection, connection_record, connection_proxy
+    ) -> None:
+        self.checkouts += 1
+
+    def record_wait(self, elapsed: float) -> None:
+        self.waited += 1
+        self.total_wait += elapsed
+        self.max_wait = max(self.max_wait, elapsed)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times how long checkouts wait for a connection."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self) -> "MeteredQueuePool":
+        pool = cast(MeteredQueuePool, super().recreate())
+        pool.metrics = self.metrics
+        return pool
+
+
+def metered_pool(engine: AsyncEngine) -> MeteredQueuePool:
+    """Returns the metered pool of an engine created by `new_engine`."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        raise TypeError(f"Engine uses {type(pool).__name__}, not MeteredQueuePool")
+    return pool
+
+
+def new_engine(
+    psql_config: PostgresConfig,
+    database_uri: str | None = None
+) -> AsyncEngine:
     raw_url = "postgresql+psycopg://{login}:{password}@{host}:{port}/{database}"
-    database_uri = raw_url.format(
+    database_uri = database_uri or raw_url.format(
         login=psql_config.login,
         password=psql_config.password,
         host=psql_config.host,
@@ -14,15 +101,150 @@ def new_session_maker(psql_config: PostgresConfig) -> async_sessionmaker[AsyncSe
     )
     engine = create_async_engine(
         database_uri,
-        pool_size=15,
-        max_overflow=15,
+        poolclass=MeteredQueuePool,
+        pool_size=psql_config.pool_size,
+        max_overflow=psql_config.max_overflow,
+        pool_timeout=psql_config.pool_timeout,
+        pool_recycle=psql_config.pool_recycle,
+        pool_pre_ping=psql_config.pool_pre_ping,
         connect_args={
-            "connect_timeout": 5,
+            "connect_timeout": psql_config.connect_timeout,
+            "prepare_threshold": psql_config.prepare_threshold,
+            "options": "-c statement_timeout={timeout}".format(
+                timeout=psql_config.statement_timeout
+            ),
         },
     )
+    metrics = PoolMetrics()
+    metered_pool(engine).metrics = metrics
+    event.listen(engine.sync_engine, "connect", metrics.on_connect)
+    event.listen(engine.sync_engine, "checkout", metrics.on_checkout)
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> PostgresPoolStats:
+    """Returns a snapshot of the engine's connection pool usage."""
+    pool = metered_pool(engine)
+    metrics = pool.metrics or PoolMetrics()
+    return PostgresPoolStats(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+        connects=metrics.connects,
+        checkouts=metrics.checkouts,
+        timeouts=metrics.timeouts,
+        avg_wait=metrics.total_wait / metrics.waited if metrics.waited else 0.0,
+        max_wait=metrics.max_wait,
+    )
+
+
+def new_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(
-        bind=engine, 
-        class_=AsyncSession, 
-        autoflush=False, 
+        bind=engine,
+        class_=AsyncSession,
+        autoflush=False,
         expire_on_commit=False
-    )
\ No newline at end of file
+    )
+
+
+ReplicaSession = NewType("ReplicaSession", AsyncSession)
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions bound to a read replica, chosen round-robin or
+    by fewest checked-out connections. A replica whose connection
+    fails is skipped for `cooldown` seconds; when none is usable the
+    primary session maker is used instead. Sessions connect lazily, so
+    requests answered without SQL never touch a replica; only a replica
+    coming back from its cooldown is probed before its session is
+    handed out, falling back within the same request if it is still
+    down.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[AsyncEngine],
+        balancing: str,
+        cooldown: float
+    ) -> None:
+        self._primary = primary
+        self._replicas = replicas
+        self._makers = [new_session_maker(engine) for engine in replicas]
+        self._balancing = balancing
+        self._cooldown = cooldown
+        self._down_until = [0.0] * len(replicas)
+        self._suspect = [False] * len(replicas)
+        self._next = itertools.cycle(range(len(replicas)))
+        for index, engine in enumerate(replicas):
+            event.listen(
+                engine.sync_engine,
+                "handle_error",
+                partial(self._on_error, index)
+            )
+
+    async def session(self) -> AsyncSession:
+        """
+        Returns a session for the next healthy replica. A replica whose
+        cooldown just ended is connected to first; if that fails it is
+        marked down again and the next one is tried, ending with the
+        primary.
+        """
+        for index in self._candidates():
+            session = self._makers[index]()
+            if not self._suspect[index]:
+                return session
+            try:
+                await session.connection()
+            except (OperationalError, PoolTimeoutError, OSError):
+                await session.close()
+                self._mark_down(index)
+                continue
+            self._suspect[index] = False
+            return session
+        return self._primary()
+
+    async def dispose(self) -> None:
+        for engine in self._replicas:
+            await engine.dispose()
+
+    def _on_error(self, index: int, context: ExceptionContext) -> None:
+        if context.is_disconnect or isinstance(
+            context.sqlalchemy_exception, OperationalError
+        ):
+            self._mark_down(index)
+
+    def _mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self._cooldown
+        self._suspect[index] = True
+
+    def _checked_out(self, index: int) -> int:
+        return metered_pool(self._replicas[index]).checkedout()
+
+    def _candidates(self) -> list[int]:
+        now = time.monotonic()
+        healthy = [
+            index for index in range(len(self._replicas))
+            if self._down_until[index] <= now
+        ]
+        if not healthy:
+            return []
+        if self._balancing == "least_connections":
+            return sorted(healthy, key=self._checked_out)
+        start = next(self._next)
+        return sorted(
+            healthy, key=lambda index: (index - start) % len(self._replicas)
+        )
+
+
+def new_replica_router(
+    psql_config: PostgresConfig,
+    primary: async_sessionmaker[AsyncSession]
+) -> ReplicaRouter:
+    return ReplicaRouter(
+        primary=primary,
+        replicas=[new_engine(psql_config, dsn) for dsn in psql_config.replicas],
+        balancing=psql_config.replica_balancing,
+        cooldown=psql_config.replica_cooldown,
+    )
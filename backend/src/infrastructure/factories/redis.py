@@ -1,12 +1,77 @@
-from redis.asyncio import Redis
+from dataclasses import dataclass
+
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from backend.src.config import RedisConfig
 
 
-async def new_redis_client(redis_config: RedisConfig) -> Redis:
-    return Redis(
+@dataclass(slots=True, frozen=True)
+class RedisPoolStats:
+    max_connections: int
+    in_use: int
+    idle: int
+    waits: int
+
+
+class MeteredConnectionPool(BlockingConnectionPool):
+    """
+    Blocking connection pool that counts how often
+    a checkout had to wait for a free connection.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+
+    async def get_connection(self, *args, **kwargs):
+        if (
+            not self._available_connections
+            and len(self._in_use_connections) >= self.max_connections
+        ):
+            self.waits += 1
+        return await super().get_connection(*args, **kwargs)
+
+    def stats(self) -> RedisPoolStats:
+        """Returns a snapshot of the pool usage."""
+        return RedisPoolStats(
+            max_connections=self.max_connections,
+            in_use=len(self._in_use_connections),
+            idle=len(self._available_connections),
+            waits=self.waits,
+        )
+
+
+def new_redis_pool(redis_config: RedisConfig) -> MeteredConnectionPool:
+    return MeteredConnectionPool(
         host=redis_config.host,
         port=redis_config.port,
         db=redis_config.db,
-        password=redis_config.password
-    )
\ No newline at end of file
+        password=redis_config.password,
+        max_connections=redis_config.max_connections,
+        timeout=redis_config.pool_timeout,
+        socket_timeout=redis_config.socket_timeout,
+        socket_connect_timeout=redis_config.socket_connect_timeout,
+        socket_keepalive=redis_config.socket_keepalive,
+        health_check_interval=redis_config.health_check_interval,
+    )
+
+
+def new_redis_pool_from_url(
+    url: str,
+    redis_config: RedisConfig
+) -> MeteredConnectionPool:
+    """Pool for a single shard; settings in the URL take precedence."""
+    return MeteredConnectionPool.from_url(
+        url,
+        password=redis_config.password,
+        max_connections=redis_config.max_connections,
+        timeout=redis_config.pool_timeout,
+        socket_timeout=redis_config.socket_timeout,
+        socket_connect_timeout=redis_config.socket_connect_timeout,
+        socket_keepalive=redis_config.socket_keepalive,
+        health_check_interval=redis_config.health_check_interval,
+    )
+
+
+def new_redis_client(pool: MeteredConnectionPool) -> Redis:
+    return Redis(connection_pool=pool)
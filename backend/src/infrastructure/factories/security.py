@@ -0,0 +1,13 @@
+from argon2 import PasswordHasher
+
+from backend.src.config import SecretConfig
+
+
+def new_password_hasher(secret_config: SecretConfig) -> PasswordHasher:
+    return PasswordHasher(
+        time_cost=secret_config.argon2_time_cost,
+        memory_cost=secret_config.argon2_memory_cost,
+        parallelism=secret_config.argon2_parallelism,
+        hash_len=secret_config.argon2_hash_len,
+        salt_len=secret_config.argon2_salt_len,
+    )
@@ -1,81 +1,394 @@
 import contextlib
+from dataclasses import replace
+from typing import Any, Callable, Iterable, Optional, TypeVar
 from uuid import UUID
 
 from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from backend.src.infrastructure._types import RequestResponseEndpoint
-from backend.src.infrastructure.repositories.sessions import (
-    GuestSessionBackend,
-    RedisSessionBackend,
+from backend.src.application.interfaces import (
+    ICookieBackend,
+    IGuestSessionBackend,
+    ISessionBackend,
 )
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.tracing import start_trace
 
+_SKIP_SESSION_ATTR = "__skip_session__"
 
-class SessionMiddleware(BaseHTTPMiddleware):
+Endpoint = TypeVar("Endpoint", bound=Callable)
+
+
+def skip_session(endpoint: Endpoint) -> Endpoint:
+    """
+    Marks a route endpoint as session-free: the session is never
+    loaded from Redis and no guest session is issued for it.
+    Must be applied below the router decorator.
+    """
+    setattr(endpoint, _SKIP_SESSION_ATTR, True)
+    return endpoint
+
+
+def _session_skipped(scope: Scope) -> bool:
+    return getattr(scope.get("endpoint"), _SKIP_SESSION_ATTR, False)
+
+
+class LazySession:
+    """
+    Proxy stored on `request.state.session` that defers the Redis
+    lookup until a handler awaits `load()` for the first time.
+    `promote` and `clear` tell the middleware to rotate or drop
+    the auth cookie.
+    """
+
+    __slots__ = (
+        "_backend", "_scope", "_session_id", "_data", "_loaded",
+        "_rotated", "_cleared",
+    )
+
+    def __init__(
+        self,
+        backend: ISessionBackend[UUID, SessionData],
+        scope: Scope,
+        session_id: Optional[UUID]
+    ) -> None:
+        self._backend = backend
+        self._scope = scope
+        self._session_id = session_id
+        self._data: Optional[SessionData] = None
+        self._loaded = False
+        self._rotated = False
+        self._cleared = False
+
+    @property
+    def session_id(self) -> Optional[UUID]:
+        """Auth session ID from the cookie, or the one issued by `promote`."""
+        return self._session_id
+
+    @property
+    def rotated(self) -> bool:
+        """Whether a new session ID was issued in this request."""
+        return self._rotated
+
+    @property
+    def cleared(self) -> bool:
+        """Whether `clear` dropped the session in this request."""
+        return self._cleared
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the session has already been read from Redis."""
+        return self._loaded
+
+    async def load(self) -> Optional[SessionData]:
+        """Reads the session from Redis once and caches the result."""
+        if not self._loaded:
+            if self._session_id and not _session_skipped(self._scope):
+                self._data = await self._backend.read(self._session_id)
+            self._loaded = True
+        return self._data
+
+    async def patch(self, **fields: Any) -> None:
+        """
+        Writes only the given fields of the current session. Backends
+        that re-issue the session rotate the auth cookie.
+        """
+        if not self._session_id:
+            return
+        session_id = await self._backend.patch(self._session_id, **fields)
+        if session_id != self._session_id:
+            self._session_id = session_id
+            self._rotated = True
+        if self._data is not None:
+            self._data = replace(self._data, **fields)
+
+    async def promote(
+        self,
+        data: SessionData,
+        guest_id: Optional[UUID]
+    ) -> UUID:
+        """
+        Starts an authenticated session under a new ID, carrying over
+        the guest's data and replacing any current session.
+        """
+        self._session_id = await self._backend.promote(
+            data, guest_id, self._session_id
+        )
+        self._data = data
+        self._loaded = True
+        self._rotated = True
+        self._cleared = False
+        return self._session_id
+
+    async def clear(self) -> None:
+        """Deletes the current session."""
+        if self._session_id:
+            await self._backend.delete(self._session_id)
+        self._session_id = None
+        self._data = None
+        self._loaded = True
+        self._rotated = False
+        self._cleared = True
+
+
+class LazyGuestData:
+    """
+    Proxy stored on `request.state.guest` for server-side guest data.
+    Reads hit Redis once; writes are buffered and flushed by the
+    middleware in a single call when the response starts.
+    """
+
+    __slots__ = ("_backend", "_session_id", "_data", "_pending", "_required")
+
+    def __init__(
+        self,
+        backend: IGuestSessionBackend[UUID, dict],
+        session_id: Optional[UUID]
+    ) -> None:
+        self._backend = backend
+        self._session_id = session_id
+        self._data: Optional[dict[str, Any]] = None
+        self._pending: dict[str, Any] = {}
+        self._required = False
+
+    @property
+    def session_id(self) -> Optional[UUID]:
+        """Guest session ID from the cookie or issued for this response."""
+        return self._session_id
+
+    @property
+    def needs_session(self) -> bool:
+        """Whether a guest session must be issued with this response."""
+        return self._session_id is None and (self._required or bool(self._pending))
+
+    def require(self) -> None:
+        """Asks for a guest session to be issued even without data."""
+        self._required = True
+
+    async def load(self) -> dict[str, Any]:
+        """Returns the guest data, including writes not flushed yet."""
+        if self._data is None:
+            self._data = (
+                await self._backend.get_guest_data(self._session_id)
+                if self._session_id else {}
+            )
+            self._data.update(self._pending)
+        return self._data
+
+    def update(self, **fields: Any) -> None:
+        """Buffers fields to be merged into the stored guest data."""
+        self._pending.update(fields)
+        if self._data is not None:
+            self._data.update(fields)
+
+    def issue(self, session_id: UUID) -> None:
+        """Binds buffered writes to a newly issued guest session."""
+        self._session_id = session_id
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the handler wrote fields that are not flushed yet."""
+        return bool(self._pending)
+
+    def pop_pending(self) -> dict[str, Any]:
+        """Returns and forgets the buffered fields."""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    async def flush(self) -> None:
+        """Writes buffered fields to the backend in one call."""
+        if self._pending and self._session_id:
+            await self._backend.update_guest_data(
+                self._session_id, self.pop_pending()
+            )
+
+
+def _append_cookies(message: Message, cookies: Response) -> None:
+    """
+    Adds the `Set-Cookie` headers collected on `cookies` to a response
+    start message, one per cookie name; cookies the handler already
+    set on the response take precedence.
+    """
+    headers = MutableHeaders(scope=message)
+    present = {value.split("=", 1)[0] for value in headers.getlist("set-cookie")}
+    collected: dict[str, str] = {}
+    for key, value in cookies.raw_headers:
+        if key == b"set-cookie":
+            cookie = value.decode("latin-1")
+            collected[cookie.split("=", 1)[0]] = cookie
+    for name, cookie in collected.items():
+        if name not in present:
+            headers.append("set-cookie", cookie)
+
+
+class SessionMiddleware:
     """Middleware for managing authentication and guest sessions."""
 
     def __init__(
-        self, 
-        app: ASGIApp, 
-        redis_manager: RedisSessionBackend, 
-        guest_manager: GuestSessionBackend
+        self,
+        app: ASGIApp,
+        redis_manager: ISessionBackend[UUID, SessionData],
+        guest_manager: IGuestSessionBackend[UUID, dict],
+        cookie_manager: ICookieBackend,
+        cookie_max_age: int,
+        excluded_paths: Iterable[str] = ()
     ) -> None:
         """
         Initializes the session middleware with Redis and guest session backends.
         Args:
-            app (FastAPI): The FastAPI application instance.
-            redis_manager (RedisSessionBackend): Redis backend for managing
+            app (ASGIApp): The wrapped ASGI application.
+            redis_manager (ISessionBackend): Backend for managing
               authenticated sessions.
-            guest_manager (GuestSessionBackend): Guest session manager for
+            guest_manager (IGuestSessionBackend): Guest session manager for
               handling unauthenticated users.
+            cookie_manager (ICookieBackend): Sets and clears the auth
+              session cookie.
+            cookie_max_age (int): Lifetime of the auth session cookie in
+              seconds, normally the absolute session TTL.
+            excluded_paths (Iterable[str]): Paths (health checks, static
+              files, bot endpoints) served without any session handling.
+              Each entry matches itself and everything below it, so
+              `/health` covers `/health/live` but not `/healthz`.
         """
-        super().__init__(app)
+        self.app = app
         self.redis_backend = redis_manager
         self.guest_manager = guest_manager
+        self.cookie_manager = cookie_manager
+        self.cookie_max_age = cookie_max_age
+        bases = {path.rstrip("/") for path in excluded_paths}
+        self._excluded_exact = frozenset(base or "/" for base in bases)
+        self._excluded_prefixes = tuple(base + "/" for base in bases)
 
-    async def dispatch(
-        self, 
-        request: Request, 
-        call_next: RequestResponseEndpoint
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Handles session retrieval, management, and cleanup for 
+        Handles session retrieval, management, and cleanup for
         incoming requests.
         Execution Flow:
-        - Extracts session ID from cookies (`auth_session` or `guest_session`).
-        - If an authenticated session exists in Redis, it is loaded.
-        - If no session is found, a new guest session is created.
-        - Cleans up guest session data if an authenticated session is found.
-        - Passes the request forward to the next middleware or handler.
+        - Extracts the session ID from the `auth_session` cookie and the
+          guest session ID from the `guest_session` cookie.
+        - Places a `LazySession` on `request.state.session`; Redis is only
+          queried if a handler awaits `request.state.session.load()`.
+        - Places a `LazyGuestData` on `request.state.guest`; guest data
+          written by the handler is stored once per request.
+        - Passes the request forward to the wrapped application.
+        - On `http.response.start`, issues a guest session only if the
+          handler wrote guest data or called `request.state.guest.require()`
+          without a guest cookie. For an authenticated session, guest
+          writes and any stored guest data go to the user's data instead
+          and the guest cookie is cleared. After `promote` the auth
+          cookie carries the new ID and guest cookies are cleared; after
+          `clear` the auth cookie is removed. Cookie changes are collected
+          and emitted once per cookie name. Endpoints marked with
+          `skip_session` and excluded paths are left untouched.
         Args:
-            request (Request): The incoming HTTP request.
-            call_next (RequestResponseEndpoint): The next request 
-            handler in the middleware chain.
-        Returns:
-            Response: The processed HTTP response.
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
         """
-        session_id = request.cookies.get(
-            "auth_session"
-        ) or request.cookies.get(
-            "guest_session"
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        if self._excluded(scope["path"]):
+            request.state.session = LazySession(self.redis_backend, scope, None)
+            request.state.guest = LazyGuestData(self.guest_manager, None)
+            await self.app(scope, receive, send)
+            return
+        session_id = request.cookies.get("auth_session")
+        session_uuid = (
+            self.redis_backend.parse_cookie(session_id) if session_id else None
         )
-        request.state.session = None
-        session_data = None
-        if session_id:
+        session = LazySession(self.redis_backend, scope, session_uuid)
+        request.state.session = session
+        guest_uuid = None
+        if guest_id := request.cookies.get("guest_session"):
             with contextlib.suppress(ValueError):
-                session_uuid = UUID(session_id)
-                session_data = await self.redis_backend.read(session_uuid)
-                request.state.session = session_data or session_id
-        response: Response = await call_next(request)
-        if not request.state.session:
-            guest_session = self.guest_manager.create_guest_session(response)
-            request.state.session = guest_session
-            response.set_cookie(
-                key="guest_session", 
-                value=str(guest_session), 
-                httponly=True
-            )
-        if session_data:
-            self.guest_manager.delete_guest_session(response)
-        return response
+                guest_uuid = UUID(guest_id)
+        guest = LazyGuestData(self.guest_manager, guest_uuid)
+        request.state.guest = guest
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and not _session_skipped(scope)
+            ):
+                cookies = Response()
+                if guest.dirty and session.session_id:
+                    # Guest writes of a signed-in user belong to the user.
+                    await session.load()
+                user = await session.load() if session.loaded else None
+                if session.rotated and session.session_id is not None:
+                    self.cookie_manager.set_cookie(
+                        cookies,
+                        "auth_session",
+                        self.redis_backend.cookie_value(session.session_id),
+                        self.cookie_max_age
+                    )
+                elif session.cleared:
+                    self.cookie_manager.delete_cookie(cookies, "auth_session")
+                if user is not None:
+                    await self._adopt_guest(guest, user, adopted=session.rotated)
+                    if guest.session_id:
+                        self.guest_manager.delete_guest_session(cookies)
+                else:
+                    if guest.needs_session:
+                        guest.issue(
+                            self.guest_manager.create_guest_session(cookies)
+                        )
+                    await guest.flush()
+                _append_cookies(message, cookies)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _adopt_guest(
+        self,
+        guest: LazyGuestData,
+        user: SessionData,
+        adopted: bool
+    ) -> None:
+        """
+        Moves buffered guest writes and, unless `promote` already merged
+        it (`adopted`), the stored guest data into the user's data.
+        """
+        fields = guest.pop_pending()
+        stale = guest.session_id if not adopted else None
+        if stale:
+            fields = {
+                **await self.guest_manager.get_guest_data(stale), **fields
+            }
+        await self.redis_backend.update_user_data(user.user_id, fields)
+        if stale:
+            await self.guest_manager.delete_guest_data(stale)
+
+    def _excluded(self, path: str) -> bool:
+        return (
+            path in self._excluded_exact
+            or path.startswith(self._excluded_prefixes)
+        )
+
+
+class TracingMiddleware:
+    """
+    Collects spans recorded while serving a request and reports
+    them in a `Server-Timing` response header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = start_trace()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "server-timing", trace.server_timing()
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
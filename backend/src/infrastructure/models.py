@@ -1,28 +1,124 @@
+from dataclasses import dataclass, fields
 from enum import Enum
-from typing import Type
+from typing import Any, Generic, Iterable, Mapping, Type
 
 import sqlalchemy as sa
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
     mapped_column,
-    object_mapper,
 )
 
 from backend.src.infrastructure._types import DomainModel
 
 
+@dataclass(slots=True, frozen=True)
+class Projection(Generic[DomainModel]):
+    """
+    Column selection for one dataclass plus the mapping of result rows
+    onto it. Columns follow the dataclass field order, so a row maps
+    positionally.
+    """
+    columns: tuple[Any, ...]
+    dataclass: Type[DomainModel]
+
+    def select(self) -> sa.Select:
+        return sa.select(*self.columns)
+
+    def map(self, row: Iterable[Any]) -> DomainModel:
+        return self.dataclass(*row)
+
+    def map_all(self, rows: Iterable[Iterable[Any]]) -> list[DomainModel]:
+        factory = self.dataclass
+        return [factory(*row) for row in rows]
+
+
+_projections: dict[tuple[type, type], Projection] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class DomainPlan(Generic[DomainModel]):
+    """Dataclass field to ORM attribute pairs used by `Base.to_domain`."""
+    dataclass: Type[DomainModel]
+    attributes: tuple[tuple[str, str], ...]
+
+    def convert(self, instance: Any) -> DomainModel:
+        return self.dataclass(**{
+            field: getattr(instance, attr) for field, attr in self.attributes
+        })
+
+    def convert_all(self, instances: Iterable[Any]) -> list[DomainModel]:
+        factory, attributes = self.dataclass, self.attributes
+        return [
+            factory(**{
+                field: getattr(instance, attr) for field, attr in attributes
+            })
+            for instance in instances
+        ]
+
+
+_domain_plans: dict[tuple[type, type, tuple], DomainPlan] = {}
+
+
 class Base(DeclarativeBase):
+    @classmethod
+    def projection(cls, dataclass: Type[DomainModel]) -> Projection[DomainModel]:
+        """Returns the cached column projection of this model onto a dataclass."""
+        key = (cls, dataclass)
+        if (projection := _projections.get(key)) is None:
+            projection = Projection(
+                columns=tuple(
+                    getattr(cls, field.name) for field in fields(dataclass)
+                ),
+                dataclass=dataclass,
+            )
+            _projections[key] = projection
+        return projection
+
+    @classmethod
+    def domain_plan(
+        cls,
+        dataclass: Type[DomainModel],
+        field_map: Mapping[str, str] | None = None
+    ) -> DomainPlan[DomainModel]:
+        """
+        Returns the cached conversion plan of this model onto a
+        dataclass. `field_map` renames dataclass fields to ORM
+        attributes; dataclass fields without a matching attribute
+        are left to their defaults.
+        """
+        key = (cls, dataclass, tuple(sorted((field_map or {}).items())))
+        if (plan := _domain_plans.get(key)) is None:
+            renames = field_map or {}
+            attrs = set(sa.inspect(cls).attrs.keys())
+            plan = DomainPlan(
+                dataclass=dataclass,
+                attributes=tuple(
+                    (field.name, renames.get(field.name, field.name))
+                    for field in fields(dataclass)
+                    if renames.get(field.name, field.name) in attrs
+                ),
+            )
+            _domain_plans[key] = plan
+        return plan
+
     def to_domain(
         self, 
-        dataclass: Type[DomainModel]
+        dataclass: Type[DomainModel],
+        field_map: Mapping[str, str] | None = None
     ) -> DomainModel:
         """Mapping ORM model to dataclass"""
-        data = {
-            attr.key: getattr(self, attr.key)
-            for attr in object_mapper(self).attrs
-        }
-        return dataclass(**data)
+        return self.domain_plan(dataclass, field_map).convert(self)
+
+    @classmethod
+    def to_domain_many(
+        cls,
+        instances: Iterable["Base"],
+        dataclass: Type[DomainModel],
+        field_map: Mapping[str, str] | None = None
+    ) -> list[DomainModel]:
+        """Mapping a list of ORM models to dataclasses with one plan"""
+        return cls.domain_plan(dataclass, field_map).convert_all(instances)
 
 
 class UserRole(Enum):
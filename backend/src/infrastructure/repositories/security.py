@@ -1,10 +1,25 @@
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from typing import Callable
+
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
 
-from backend.src.application.exceptions import InvalidPasswordException
-from backend.src.application.interfaces import ISecurity
+from backend.src.application.exceptions import (
+    DomainException,
+    InvalidPasswordException,
+)
+from backend.src.application.interfaces import IPasswordRehasher, ISecurity, IUser
 from backend.src.config import SecretConfig
 from backend.src.domain.entities import PasswordDM, SignupPasswordDM
+from backend.src.infrastructure.factories.executor import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+# Opens an `IUser` in its own unit of work, committed when the block
+# exits without an error.
+UserRepoFactory = Callable[[], AbstractAsyncContextManager[IUser]]
 
 
 class SecurityRepo(ISecurity):
@@ -16,19 +31,23 @@ class SecurityRepo(ISecurity):
     def __init__(
         self,
         password_hasher: PasswordHasher,
-        app_config: SecretConfig 
+        app_config: SecretConfig,
+        executor: BoundedExecutor
     ) -> None:
         """
         Initializes the class with a password 
-        hasher and application configuration.
+        hasher, application configuration and
+        the worker pool that runs Argon2 off the event loop.
         """
         self._password_hasher = password_hasher
         self._app_config = app_config
+        self._executor = executor
 
-    async def verify_password(self, model: PasswordDM) -> None:
+    async def verify_password(self, model: PasswordDM) -> bool:
         """
         Verifies the provided password using 
-        salt and pepper for added security.
+        salt and pepper for added security and
+        reports whether the hash needs upgrading.
         """
         try:
             salted_password = "{salt}{password}{pepper}".format(
@@ -36,7 +55,8 @@ class SecurityRepo(ISecurity):
                 password=model.password,
                 pepper=self._app_config.pepper
             )
-            self._password_hasher.verify(
+            await self._executor.run(
+                self._password_hasher.verify,
                 hash=model.hashed_password, 
                 password=salted_password
             )
@@ -44,6 +64,7 @@ class SecurityRepo(ISecurity):
             VerifyMismatchError, VerificationError, InvalidHashError
         ) as e:
             raise InvalidPasswordException() from e
+        return self._password_hasher.check_needs_rehash(model.hashed_password)
 
     async def hash_password(self, model: SignupPasswordDM) -> PasswordDM:
         """
@@ -56,5 +77,47 @@ class SecurityRepo(ISecurity):
             password=model.password,
             pepper=self._app_config.pepper
         )
-        hashed_password = self._password_hasher.hash(salted_password)
+        hashed_password = await self._executor.run(
+            self._password_hasher.hash, salted_password
+        )
         return PasswordDM(model.salt, model.password, hashed_password)
+
+
+class PasswordRehasher(IPasswordRehasher):
+    """
+    Upgrades hashes produced with outdated Argon2 parameters after
+    a successful login, on the primary database and off the request.
+    At most one rehash per user is in flight.
+    """
+
+    def __init__(
+        self,
+        security: ISecurity,
+        open_user_repo: UserRepoFactory
+    ) -> None:
+        self._security = security
+        self._open_user_repo = open_user_repo
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+
+    def schedule(self, user_id: int, model: PasswordDM) -> None:
+        if user_id in self._tasks:
+            return
+        task = asyncio.create_task(self._rehash(user_id, model))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(user_id, None))
+
+    async def close(self) -> None:
+        """Waits for pending rehashes to finish."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _rehash(self, user_id: int, model: PasswordDM) -> None:
+        try:
+            rehashed = await self._security.hash_password(
+                SignupPasswordDM(salt=model.salt, password=model.password)
+            )
+            async with self._open_user_repo() as user_repo:
+                await user_repo.update_password(
+                    user_id, model.hashed_password, rehashed.hashed_password
+                )
+        except (Exception, DomainException):
+            logger.exception("Password rehash failed for user %s", user_id)
@@ -0,0 +1,285 @@
+import asyncio
+import contextlib
+import copy
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, TimeoutError
+
+from backend.src.application.interfaces import ISessionBackend
+from backend.src.domain.entities import SessionData
+
+INVALIDATION_CHANNEL = "sessions:invalidate"
+# Seconds the invalidation listener waits for a message before polling again.
+_LISTEN_POLL_INTERVAL = 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class SessionCacheStats:
+    entries: int
+    size_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+def _sizeof(data: SessionData) -> int:
+    """Shallow estimate of the memory held by a session entry."""
+    return sys.getsizeof(data) + sum(
+        sys.getsizeof(value) for value in vars(data).values()
+    )
+
+
+class SessionCache:
+    """
+    Bounded in-process LRU of session data with a
+    per-entry TTL and a total size limit in bytes.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[UUID, tuple[float, int, SessionData]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, session_id: UUID) -> Optional[SessionData]:
+        """Returns a copy of the cached session, or None on miss/expiry."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, _, data = entry
+        if expires_at < time.monotonic():
+            self._remove(session_id)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self._hits += 1
+        return copy.copy(data)
+
+    def put(self, session_id: UUID, data: SessionData) -> None:
+        """Stores a session, evicting least recently used entries."""
+        self._remove(session_id)
+        size = _sizeof(data)
+        if size > self._max_bytes:
+            return
+        self._entries[session_id] = (
+            time.monotonic() + self._ttl, size, copy.copy(data)
+        )
+        self._size += size
+        while (
+            len(self._entries) > self._max_entries
+            or self._size > self._max_bytes
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self._evictions += 1
+
+    def invalidate(self, session_id: UUID) -> None:
+        """Drops a session that was changed elsewhere."""
+        if self._remove(session_id):
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> SessionCacheStats:
+        """Returns hit/miss/eviction counters."""
+        return SessionCacheStats(
+            entries=len(self._entries),
+            size_bytes=self._size,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+        )
+
+    def _remove(self, session_id: UUID) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        self._size -= entry[1]
+        return True
+
+
+class CachedSessionBackend(ISessionBackend[UUID, SessionData]):
+    """
+    Serves session reads from an in-process cache in front of another
+    backend. Updates and deletes are broadcast over Redis pub/sub so
+    every worker drops its copy.
+    """
+
+    def __init__(
+        self,
+        backend: ISessionBackend[UUID, SessionData],
+        redis: Redis,
+        cache: SessionCache
+    ) -> None:
+        self._backend = backend
+        self._redis = redis
+        self._cache = cache
+        self._origin = uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    def parse_cookie(self, value: str) -> Optional[UUID]:
+        return self._backend.parse_cookie(value)
+
+    def cookie_value(self, session_id: UUID) -> str:
+        return self._backend.cookie_value(session_id)
+
+    async def create(self, session_id: UUID, data: SessionData) -> UUID:
+        """Creates a session and caches it locally."""
+        session_id = await self._backend.create(session_id, data)
+        self._cache.put(session_id, data)
+        return session_id
+
+    async def read(self, session_id: UUID) -> Optional[SessionData]:
+        """Returns the cached session or falls back to the backend."""
+        if (data := self._cache.get(session_id)) is not None:
+            return data
+        data = await self._backend.read(session_id)
+        if data is not None:
+            self._cache.put(session_id, data)
+        return data
+
+    async def update(self, session_id: UUID, data: SessionData) -> UUID:
+        """Updates a session and invalidates it on other workers."""
+        new_id = await self._backend.update(session_id, data)
+        if new_id != session_id:
+            self._cache.invalidate(session_id)
+        self._cache.put(new_id, data)
+        await self._publish(session_id)
+        return new_id
+
+    async def patch(self, session_id: UUID, **fields: Any) -> UUID:
+        """Patches a session and invalidates it on every worker."""
+        new_id = await self._backend.patch(session_id, **fields)
+        self._cache.invalidate(session_id)
+        await self._publish(session_id)
+        return new_id
+
+    async def delete(self, session_id: UUID) -> None:
+        """Deletes a session and invalidates it on every worker."""
+        await self._backend.delete(session_id)
+        self._cache.invalidate(session_id)
+        await self._publish(session_id)
+
+    async def read_many(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        """Serves cached sessions and reads the rest in one batch."""
+        sessions = {}
+        missing = []
+        for session_id in session_ids:
+            if (data := self._cache.get(session_id)) is not None:
+                sessions[session_id] = data
+            else:
+                missing.append(session_id)
+        if missing:
+            sessions.update(await self._backend.read_many(missing))
+        return sessions
+
+    async def delete_many(self, session_ids: Iterable[UUID]) -> None:
+        """Deletes several sessions and invalidates them everywhere."""
+        session_ids = list(session_ids)
+        await self._backend.delete_many(session_ids)
+        for session_id in session_ids:
+            self._cache.invalidate(session_id)
+        await self._publish(*session_ids)
+
+    async def revoke_user(self, user_id: int) -> list[UUID]:
+        """Revokes all sessions of a user and invalidates them everywhere."""
+        revoked = await self._backend.revoke_user(user_id)
+        for session_id in revoked:
+            self._cache.invalidate(session_id)
+        await self._publish(*revoked)
+        return revoked
+
+    async def promote(
+        self,
+        data: SessionData,
+        guest_id: Optional[UUID] = None,
+        previous_id: Optional[UUID] = None
+    ) -> UUID:
+        """Promotes a visitor and caches the new session locally."""
+        session_id = await self._backend.promote(data, guest_id, previous_id)
+        self._cache.put(session_id, data)
+        if previous_id:
+            self._cache.invalidate(previous_id)
+            await self._publish(previous_id)
+        return session_id
+
+    async def read_user_data(self, user_id: int) -> dict[str, Any]:
+        return await self._backend.read_user_data(user_id)
+
+    async def update_user_data(self, user_id: int, fields: dict[str, Any]) -> None:
+        await self._backend.update_user_data(user_id, fields)
+
+    def stats(self) -> SessionCacheStats:
+        return self._cache.stats()
+
+    async def start(self) -> None:
+        """Starts listening for invalidations from other workers."""
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stops the invalidation listener."""
+        if self._listener:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _publish(self, *session_ids: UUID) -> None:
+        if not session_ids:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.publish(
+                    INVALIDATION_CHANNEL, f"{self._origin}:{session_id.hex}"
+                )
+            await pipe.execute()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    while True:
+                        # Poll with an explicit timeout: an idle channel
+                        # then yields None instead of hitting the pool's
+                        # socket timeout and forcing a reconnect.
+                        message = await pubsub.get_message(
+                            timeout=_LISTEN_POLL_INTERVAL
+                        )
+                        if message is None:
+                            continue
+                        if message["type"] == "subscribe":
+                            # Invalidations may have been missed while
+                            # (re)connecting, so start from a clean slate.
+                            self._cache.clear()
+                        elif message["type"] == "message":
+                            origin, _, session_hex = (
+                                message["data"].decode().partition(":")
+                            )
+                            if origin != self._origin:
+                                self._cache.invalidate(UUID(hex=session_hex))
+            except (ConnectionError, TimeoutError, OSError):
+                self._cache.clear()
+                await asyncio.sleep(1)
@@ -1,62 +1,620 @@
+import abc
 import json
-from dataclasses import asdict
-from typing import Optional
+import time
+from collections import OrderedDict
+from dataclasses import fields as dataclass_fields
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Iterable, Optional, cast
 from uuid import UUID, uuid4
 
 from fastapi import Request, Response
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
 
 from backend.src.application.interfaces import IGuestSessionBackend, ISessionBackend
+from backend.src.config import RedisConfig
 from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.codecs import SessionSerializer
 from backend.src.infrastructure.repositories.cookies import CookieRepo
 
+# Stored values are prefixed with the session creation time as a
+# fixed-width ASCII epoch, so the absolute lifetime survives updates.
+_CREATED_WIDTH = 10
+_CREATED_FIELD = "_created"
+_REFRESH_TRACKING_LIMIT = 100_000
 
-class RedisSessionBackend(ISessionBackend[UUID, SessionData]):
-    """Manages session storage in Redis."""
+# KEYS[1] - session key, KEYS[2] - per-user index set; ARGV[1] -
+# payload, ARGV[2] - header for a new session, ARGV[3] - idle TTL,
+# ARGV[4] - absolute TTL, ARGV[5] - session ID. Keeps the creation
+# header and the current TTL of an existing session, indexes it and
+# returns the previous value.
+_UPDATE_SCRIPT = """
+local old = redis.call('GET', KEYS[1])
+if old and string.match(old, '^' .. string.rep('%d', 10)) then
+    redis.call('SET', KEYS[1], string.sub(old, 1, 10) .. ARGV[1], 'KEEPTTL')
+else
+    redis.call('SET', KEYS[1], ARGV[2] .. ARGV[1], 'EX', ARGV[3])
+end
+redis.call('SADD', KEYS[2], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return old
+"""
+
+# KEYS[1] - session key; ARGV[1] - idle TTL, ARGV[2] - absolute TTL,
+# ARGV[3] - current time. Returns the value and extends its TTL to the
+# idle TTL, capped by the time left before the absolute TTL; a session
+# past its absolute TTL is deleted.
+_REFRESH_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return false
+end
+local ttl = tonumber(ARGV[1])
+if string.match(value, '^' .. string.rep('%d', 10)) then
+    local remaining = tonumber(string.sub(value, 1, 10)) + ARGV[2] - ARGV[3]
+    if remaining <= 0 then
+        redis.call('DEL', KEYS[1])
+        return false
+    end
+    ttl = math.min(ttl, remaining)
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return value
+"""
+
+# KEYS[1] - session key, KEYS[2] - per-user index set or ''; ARGV[1] -
+# '1' to create a missing session, ARGV[2] - creation time, ARGV[3] -
+# idle TTL, ARGV[4] - absolute TTL, ARGV[5] - session ID, ARGV[6..] -
+# field/value pairs. Existing sessions keep their TTL; the session is
+# indexed only if it was written. Returns whether it was written and
+# the previous encoded user_id, or ''.
+_HASH_WRITE_SCRIPT = """
+local owner = redis.call('HGET', KEYS[1], 'user_id') or ''
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 6))
+elseif ARGV[1] == '1' then
+    redis.call('HSET', KEYS[1], '_created', ARGV[2], unpack(ARGV, 6))
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+else
+    return {0, ''}
+end
+if KEYS[2] ~= '' then
+    redis.call('SADD', KEYS[2], ARGV[5])
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+return {1, owner}
+"""
+
+# KEYS[1] - session hash; ARGV[1] - idle TTL, ARGV[2] - absolute TTL,
+# ARGV[3] - current time. Same as _REFRESH_SCRIPT for hash sessions,
+# returning the flat field/value list of HGETALL.
+_HASH_REFRESH_SCRIPT = """
+local raw = redis.call('HGETALL', KEYS[1])
+if #raw == 0 then
+    return raw
+end
+local ttl = tonumber(ARGV[1])
+local created = redis.call('HGET', KEYS[1], '_created')
+if created then
+    local remaining = tonumber(created) + ARGV[2] - ARGV[3]
+    if remaining <= 0 then
+        redis.call('DEL', KEYS[1])
+        return {}
+    end
+    ttl = math.min(ttl, remaining)
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return raw
+"""
+
+# KEYS[1] - per-user index set. Deletes every indexed session and the
+# index itself atomically, returning the keys that still existed.
+_REVOKE_USER_SCRIPT = """
+local revoked = {}
+for _, key in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    if redis.call('DEL', key) == 1 then
+        table.insert(revoked, key)
+    end
+end
+redis.call('DEL', KEYS[1])
+return revoked
+"""
+
+# KEYS[1] - new session key, KEYS[2] - per-user index set, KEYS[3] -
+# user data hash, KEYS[4] - guest data hash or '', KEYS[5] - previous
+# session key or ''; ARGV[1] - 'string', 'hash' or 'none' (the session
+# lives outside Redis) storage, ARGV[2] -
+# session TTL, ARGV[3] - absolute TTL, ARGV[4] - new session ID,
+# ARGV[5] - creation time, ARGV[6..] - string value or field/value
+# pairs. Returns the number of guest fields merged.
+PROMOTE_SCRIPT = """
+if ARGV[1] == 'hash' then
+    redis.call('DEL', KEYS[1])
+    redis.call('HSET', KEYS[1], '_created', ARGV[5], unpack(ARGV, 6))
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+elseif ARGV[1] == 'string' then
+    redis.call('SET', KEYS[1], ARGV[6], 'EX', ARGV[2])
+end
+redis.call('SADD', KEYS[2], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+local merged = 0
+if KEYS[4] ~= '' then
+    local guest = redis.call('HGETALL', KEYS[4])
+    if #guest > 0 then
+        redis.call('HSET', KEYS[3], unpack(guest))
+        redis.call('EXPIRE', KEYS[3], ARGV[3])
+        merged = #guest / 2
+    end
+    redis.call('DEL', KEYS[4])
+end
+if KEYS[5] ~= '' and KEYS[5] ~= KEYS[1] then
+    redis.call('DEL', KEYS[5])
+end
+return merged
+"""
+
+
+def guest_data_key(session_id: UUID) -> str:
+    return f"guest_data:{session_id.hex}"
+
+
+def user_data_key(user_id: int) -> str:
+    return f"user_data:{user_id}"
+
+
+def user_sessions_key(user_id: int) -> str:
+    return f"user_sessions:{user_id}"
+
+
+class _RedisSessionStore(abc.ABC):
+    """Sliding and absolute expiry bookkeeping shared by Redis backends."""
 
     def __init__(
         self,
-        redis: Redis
+        redis: Redis,
+        config: RedisConfig,
+        new_id: Callable[[], UUID] = uuid4
     ) -> None:
         self._redis = redis
+        self._config = config
+        self._new_id = new_id
+        self._refreshed: OrderedDict[UUID, float] = OrderedDict()
+        self._revoke_script = redis.register_script(_REVOKE_USER_SCRIPT)
+        self._promote_script = redis.register_script(PROMOTE_SCRIPT)
+
+    def parse_cookie(self, value: str) -> Optional[UUID]:
+        try:
+            return UUID(value)
+        except ValueError:
+            return None
+
+    def cookie_value(self, session_id: UUID) -> str:
+        return str(session_id)
+
+    async def delete_many(self, session_ids: Iterable[UUID]) -> None:
+        """Deletes several sessions with a single DEL."""
+        session_ids = list(session_ids)
+        if session_ids:
+            await self._redis.delete(
+                *(session_id.hex for session_id in session_ids)
+            )
+        for session_id in session_ids:
+            self._refreshed.pop(session_id, None)
+
+    async def revoke_user(self, user_id: int) -> list[UUID]:
+        """Deletes every session of a user through the per-user index."""
+        keys = await self._revoke_script(keys=[user_sessions_key(user_id)])
+        revoked = [UUID(hex=key.decode()) for key in keys]
+        for session_id in revoked:
+            self._refreshed.pop(session_id, None)
+        return revoked
+
+    async def promote(
+        self,
+        data: SessionData,
+        guest_id: Optional[UUID] = None,
+        previous_id: Optional[UUID] = None
+    ) -> UUID:
+        """
+        Logs a visitor in with one script call: the session gets a
+        fresh ID, guest data moves to the user, and the guest data and
+        any previous session are deleted.
+        """
+        session_id = self._new_id()
+        storage, values = self._promote_value(data)
+        await self._promote_script(
+            keys=[
+                session_id.hex,
+                user_sessions_key(data.user_id),
+                user_data_key(data.user_id),
+                guest_data_key(guest_id) if guest_id else "",
+                previous_id.hex if previous_id else "",
+            ],
+            args=[
+                storage,
+                self._initial_ttl(),
+                self._config.session_absolute_ttl,
+                session_id.hex,
+                int(time.time()),
+                *values,
+            ]
+        )
+        self._mark_refreshed(session_id)
+        if previous_id:
+            self._refreshed.pop(previous_id, None)
+        return session_id
+
+    async def read_user_data(self, user_id: int) -> dict[str, Any]:
+        """Returns the data merged from the user's guest sessions."""
+        raw = await cast(
+            Awaitable[dict[bytes, bytes]],
+            self._redis.hgetall(user_data_key(user_id))
+        )
+        return {key.decode(): json.loads(value) for key, value in raw.items()}
+
+    async def update_user_data(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Merges fields into the user's data and restarts its TTL."""
+        if not fields:
+            return
+        key = user_data_key(user_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                field: json.dumps(value) for field, value in fields.items()
+            })
+            pipe.expire(key, self._config.session_absolute_ttl)
+            await pipe.execute()
+
+    @abc.abstractmethod
+    def _promote_value(self, data: SessionData) -> tuple[str, list[Any]]:
+        """Storage mode and encoded session for the promote script."""
+
+    def _index(self, pipe: Pipeline, session_id: UUID, user_id: int) -> None:
+        """Queues adding a session to its user's index set."""
+        index_key = user_sessions_key(user_id)
+        pipe.sadd(index_key, session_id.hex)
+        pipe.expire(index_key, self._config.session_absolute_ttl)
+
+    async def _unindex(
+        self,
+        session_id: UUID,
+        previous_user_id: int,
+        user_id: int
+    ) -> None:
+        """Drops a session from its previous owner's index set."""
+        if previous_user_id != user_id:
+            await cast(Awaitable[int], self._redis.srem(
+                user_sessions_key(previous_user_id), session_id.hex
+            ))
+
+    def _initial_ttl(self) -> int:
+        return min(
+            self._config.session_idle_ttl,
+            self._config.session_absolute_ttl
+        )
+
+    def _remaining(self, created: int) -> int:
+        """Seconds left before the absolute TTL of a session runs out."""
+        return int(created + self._config.session_absolute_ttl - time.time())
+
+    def _refresh_due(self, session_id: UUID) -> bool:
+        if not self._config.session_sliding:
+            return False
+        refreshed_at = self._refreshed.get(session_id)
+        return refreshed_at is None or (
+            time.monotonic() - refreshed_at
+            >= self._config.session_refresh_interval
+        )
+
+    def _mark_refreshed(self, session_id: UUID) -> None:
+        self._refreshed[session_id] = time.monotonic()
+        self._refreshed.move_to_end(session_id)
+        if len(self._refreshed) > _REFRESH_TRACKING_LIMIT:
+            self._refreshed.popitem(last=False)
+
+
+class RedisSessionBackend(
+    _RedisSessionStore, ISessionBackend[UUID, SessionData]
+):
+    """
+    Manages session storage in Redis.
+
+    With sliding expiration enabled, reads extend the idle TTL in the
+    same script call that fetches the session, at most once per refresh
+    interval per worker, capped by the absolute TTL, without rewriting
+    the session body.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        config: RedisConfig,
+        serializer: SessionSerializer[SessionData],
+        new_id: Callable[[], UUID] = uuid4
+    ) -> None:
+        super().__init__(redis, config, new_id)
+        self._serializer = serializer
+        self._update_script = redis.register_script(_UPDATE_SCRIPT)
+        self._refresh_script = redis.register_script(_REFRESH_SCRIPT)
 
     async def create(
         self,
         session_id: UUID,
         data: SessionData
-    ) -> None:
+    ) -> UUID:
         """Creates a new session in Redis."""
-        await self._redis.set(
-            name=session_id.hex, 
-            value=json.dumps(asdict(data)), 
-            ex=3600
-        )
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(
+                name=session_id.hex, 
+                value=self._header() + self._dumps(data),
+                ex=self._initial_ttl()
+            )
+            self._index(pipe, session_id, data.user_id)
+            await pipe.execute()
+        self._mark_refreshed(session_id)
+        return session_id
 
     async def read(self, session_id: UUID) -> Optional[SessionData]:
-        """Retrieves session data from Redis."""
-        session_data = await self._redis.get(session_id.hex)
-        return SessionData(
-            **json.loads(session_data)
-        ) if session_data else None
-
-    async def update(self, session_id: UUID, data: SessionData) -> None:
-        """Updates session data in Redis."""
-        await self._redis.set(
-            name=session_id.hex, 
-            value=json.dumps(asdict(data)), 
-            ex=3600
+        """Retrieves session data from Redis, sliding its expiry if due."""
+        session_data: Optional[bytes]
+        if self._refresh_due(session_id):
+            session_data = await self._refresh_script(
+                keys=[session_id.hex],
+                args=[
+                    self._config.session_idle_ttl,
+                    self._config.session_absolute_ttl,
+                    int(time.time()),
+                ]
+            )
+            self._mark_refreshed(session_id)
+        else:
+            session_data = await self._redis.get(session_id.hex)
+        if not session_data:
+            return None
+        created, payload = self._split(session_data)
+        if created is not None and self._remaining(created) <= 0:
+            await self.delete(session_id)
+            return None
+        return self._serializer.try_loads(payload)
+
+    async def update(self, session_id: UUID, data: SessionData) -> UUID:
+        """Updates session data in Redis, keeping its lifetime."""
+        previous = await self._update_script(
+            keys=[session_id.hex, user_sessions_key(data.user_id)],
+            args=[
+                self._dumps(data),
+                self._header(),
+                self._config.session_idle_ttl,
+                self._config.session_absolute_ttl,
+                session_id.hex,
+            ]
         )
+        if previous:
+            _, payload = self._split(previous)
+            if (old := self._serializer.try_loads(payload)) is not None:
+                await self._unindex(session_id, old.user_id, data.user_id)
+        return session_id
+
+    async def read_many(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        """
+        Reads several sessions with a single MGET. Expiry is not
+        extended, so bulk scans do not keep sessions alive.
+        """
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+        values: list[Optional[bytes]] = await self._redis.mget(
+            [session_id.hex for session_id in session_ids]
+        )
+        sessions = {}
+        for session_id, raw in zip(session_ids, values):
+            if not raw:
+                continue
+            created, payload = self._split(raw)
+            if created is not None and self._remaining(created) <= 0:
+                continue
+            if (data := self._serializer.try_loads(payload)) is not None:
+                sessions[session_id] = data
+        return sessions
+
+    async def patch(self, session_id: UUID, **fields: Any) -> UUID:
+        """
+        Changes individual session fields. The value is stored as a
+        whole, so this is a read followed by an update.
+        """
+        if data := await self.read(session_id):
+            await self.update(session_id, replace(data, **fields))
+        return session_id
+
+    async def delete(self, session_id: UUID) -> None:
+        """Deletes a session from Redis."""
+        await self._redis.delete(session_id.hex)
+        self._refreshed.pop(session_id, None)
+
+    def _dumps(self, data: SessionData) -> bytes:
+        return self._serializer.dumps(data)
+
+    def _promote_value(self, data: SessionData) -> tuple[str, list[Any]]:
+        return "string", [self._header() + self._dumps(data)]
+
+    def _header(self) -> bytes:
+        return b"%0*d" % (_CREATED_WIDTH, int(time.time()))
+
+    def _split(self, raw: bytes) -> tuple[Optional[int], bytes]:
+        """Separates the creation header from legacy or current values."""
+        header = raw[:_CREATED_WIDTH]
+        if header.isdigit():
+            return int(header), raw[_CREATED_WIDTH:]
+        return None, raw
+
+
+class RedisHashSessionBackend(
+    _RedisSessionStore, ISessionBackend[UUID, SessionData]
+):
+    """
+    Stores each session as a Redis hash with one JSON-encoded field
+    per SessionData attribute, so `patch` only sends changed fields.
+    The creation time lives in the `_created` field and the whole hash
+    shares one key-level TTL.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        config: RedisConfig,
+        new_id: Callable[[], UUID] = uuid4
+    ) -> None:
+        super().__init__(redis, config, new_id)
+        self._fields = frozenset(
+            field.name for field in dataclass_fields(SessionData)
+        )
+        self._write_script = redis.register_script(_HASH_WRITE_SCRIPT)
+        self._refresh_script = redis.register_script(_HASH_REFRESH_SCRIPT)
+
+    async def create(self, session_id: UUID, data: SessionData) -> UUID:
+        """Creates a new session hash in Redis."""
+        mapping: dict[str, str | int] = {
+            **self._encode(vars(data)),
+            _CREATED_FIELD: int(time.time()),
+        }
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(session_id.hex)
+            pipe.hset(session_id.hex, mapping=mapping)
+            pipe.expire(session_id.hex, self._initial_ttl())
+            self._index(pipe, session_id, data.user_id)
+            await pipe.execute()
+        self._mark_refreshed(session_id)
+        return session_id
+
+    async def read(self, session_id: UUID) -> Optional[SessionData]:
+        """Reads all session fields, sliding the expiry if due."""
+        raw: dict[bytes, bytes]
+        if self._refresh_due(session_id):
+            pairs = await self._refresh_script(
+                keys=[session_id.hex],
+                args=[
+                    self._config.session_idle_ttl,
+                    self._config.session_absolute_ttl,
+                    int(time.time()),
+                ]
+            )
+            raw = dict(zip(pairs[::2], pairs[1::2]))
+            self._mark_refreshed(session_id)
+        else:
+            raw = await cast(
+                Awaitable[dict[bytes, bytes]],
+                self._redis.hgetall(session_id.hex)
+            )
+        if not raw:
+            return None
+        created = raw.pop(_CREATED_FIELD.encode(), None)
+        if created is not None and self._remaining(int(created)) <= 0:
+            await self.delete(session_id)
+            return None
+        return self._decode(raw)
+
+    async def read_many(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        """
+        Reads several sessions in one pipelined round-trip without
+        extending their expiry.
+        """
+        session_ids = list(session_ids)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(session_id.hex)
+            values = await pipe.execute()
+        sessions = {}
+        for session_id, raw in zip(session_ids, values):
+            if not raw:
+                continue
+            created = raw.pop(_CREATED_FIELD.encode(), None)
+            if created is not None and self._remaining(int(created)) <= 0:
+                continue
+            if (data := self._decode(raw)) is not None:
+                sessions[session_id] = data
+        return sessions
+
+    async def update(self, session_id: UUID, data: SessionData) -> UUID:
+        """Overwrites all session fields, keeping the session lifetime."""
+        await self._write(session_id, vars(data), create=True)
+        return session_id
+
+    async def patch(self, session_id: UUID, **fields: Any) -> UUID:
+        """Writes only the given fields of an existing session."""
+        if unknown := fields.keys() - self._fields:
+            raise ValueError(f"Unknown session fields: {sorted(unknown)}")
+        if fields:
+            await self._write(session_id, fields, create=False)
+        return session_id
 
     async def delete(self, session_id: UUID) -> None:
         """Deletes a session from Redis."""
         await self._redis.delete(session_id.hex)
+        self._refreshed.pop(session_id, None)
+
+    async def _write(
+        self,
+        session_id: UUID,
+        fields: dict[str, Any],
+        create: bool
+    ) -> None:
+        args: list[Any] = [
+            "1" if create else "0",
+            int(time.time()),
+            self._config.session_idle_ttl,
+            self._config.session_absolute_ttl,
+            session_id.hex,
+        ]
+        for key, value in self._encode(fields).items():
+            args.extend((key, value))
+        index_key = (
+            user_sessions_key(fields["user_id"]) if "user_id" in fields else ""
+        )
+        written, owner = await self._write_script(
+            keys=[session_id.hex, index_key], args=args
+        )
+        if written and index_key and owner.isdigit():
+            await self._unindex(session_id, int(owner), fields["user_id"])
+
+    def _promote_value(self, data: SessionData) -> tuple[str, list[Any]]:
+        values: list[Any] = []
+        for key, value in self._encode(vars(data)).items():
+            values.extend((key, value))
+        return "hash", values
+
+    def _encode(self, fields: dict[str, Any]) -> dict[str, str]:
+        return {key: json.dumps(value) for key, value in fields.items()}
+
+    def _decode(self, raw: dict[bytes, bytes]) -> Optional[SessionData]:
+        """Decodes session fields; unknown or corrupt fields are a miss."""
+        try:
+            return SessionData(**{
+                key.decode(): json.loads(value) for key, value in raw.items()
+            })
+        except (ValueError, TypeError):
+            return None
 
 
 class GuestSessionBackend(IGuestSessionBackend[UUID, dict]):
-    """Handles guest session management using CookieManager."""
+    """
+    Handles guest session management: the guest session ID lives in
+    a cookie, the guest data in a Redis hash keyed by that ID.
+    """
 
-    def __init__(self, cookie_manager: CookieRepo):
+    def __init__(
+        self,
+        cookie_manager: CookieRepo,
+        redis: Redis,
+        config: RedisConfig
+    ) -> None:
         self._cookie_manager = cookie_manager
+        self._redis = redis
+        self._config = config
 
     def create_guest_session(self, response: Response) -> UUID:
         """Creates a new guest session."""
@@ -77,7 +635,10 @@ class GuestSessionBackend(IGuestSessionBackend[UUID, dict]):
         return UUID(session_id) if session_id else None
 
     def delete_guest_session(self, response: Response) -> None:
-        """Deletes the guest session."""
+        """
+        Deletes the guest session cookie, along with the data
+        cookie older clients may still carry.
+        """
         self._cookie_manager.delete_cookie(
             response=response, 
             key=self._cookie_manager._GUEST_COOKIE
@@ -87,23 +648,28 @@ class GuestSessionBackend(IGuestSessionBackend[UUID, dict]):
             key=self._cookie_manager._DATA_COOKIE
         )
 
-    def update_guest_data(
-            self, 
-            request: Request,
-            response: Response, 
-            new_data: dict
-        ) -> None:
-        """Updates guest data while preserving existing information."""
-        raw_data = self._cookie_manager.get_cookie(
-            request=request, 
-            key=self._cookie_manager._DATA_COOKIE
+    async def update_guest_data(self, session_id: UUID, new_data: dict) -> None:
+        """
+        Merges the given fields into the stored guest data and
+        restarts its TTL, without reading the existing data.
+        """
+        if not new_data:
+            return
+        key = guest_data_key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                field: json.dumps(value) for field, value in new_data.items()
+            })
+            pipe.expire(key, self._config.guest_data_ttl)
+            await pipe.execute()
+
+    async def get_guest_data(self, session_id: UUID) -> dict:
+        """Returns the stored guest data, or an empty dict if expired."""
+        raw = await cast(
+            Awaitable[dict[bytes, bytes]],
+            self._redis.hgetall(guest_data_key(session_id))
         )
-        current_data = json.loads(
-            raw_data
-        ) if raw_data else {}
-        current_data.update(new_data)
-        self._cookie_manager.set_cookie(
-            response=response, 
-            key=self._cookie_manager._DATA_COOKIE, 
-            value=json.dumps(current_data)
-        )
\ No newline at end of file
+        return {key.decode(): json.loads(value) for key, value in raw.items()}
+
+    async def delete_guest_data(self, session_id: UUID) -> None:
+        await self._redis.delete(guest_data_key(session_id))
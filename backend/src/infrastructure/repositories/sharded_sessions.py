@@ -0,0 +1,471 @@
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterable, Optional, cast
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, ResponseError, TimeoutError
+
+from backend.src.application.interfaces import ISessionBackend
+from backend.src.config import RedisConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.factories.redis import (
+    MeteredConnectionPool,
+    RedisPoolStats,
+    new_redis_client,
+    new_redis_pool_from_url,
+)
+from backend.src.infrastructure.repositories.sessions import (
+    guest_data_key,
+    user_data_key,
+    user_sessions_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] - session key, KEYS[2] - per-user index set; ARGV[1] - dumped
+# session value. Deletes the session only if it still holds the dumped
+# value, so a session changed or deleted meanwhile is not moved.
+_CLAIM_SCRIPT = """
+if redis.call('DUMP', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+def _hash(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping session IDs to shard names."""
+
+    def __init__(self, nodes: Iterable[str], vnodes: int) -> None:
+        points = sorted(
+            (_hash(f"{node}#{index}".encode()), node)
+            for node in nodes
+            for index in range(vnodes)
+        )
+        if not points:
+            raise ValueError("A hash ring needs at least one node")
+        self._points = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+        self.nodes = frozenset(self._nodes)
+
+    def node(self, session_id: UUID) -> str:
+        index = bisect.bisect(self._points, _hash(session_id.bytes))
+        return self._nodes[index % len(self._nodes)]
+
+    def new_id(self, node: str) -> UUID:
+        """Returns a random session ID that maps to `node`."""
+        if node not in self.nodes:
+            raise ValueError(f"Unknown ring node: {node}")
+        while True:
+            session_id = uuid4()
+            if self.node(session_id) == node:
+                return session_id
+
+
+@dataclass(slots=True, frozen=True)
+class ShardStats:
+    name: str
+    reads: int
+    writes: int
+    migrated: int
+    pool: RedisPoolStats
+
+
+@dataclass(slots=True, eq=False)
+class SessionShard:
+    """One Redis node holding part of the session keyspace."""
+
+    name: str
+    pool: MeteredConnectionPool
+    redis: Redis
+    backend: ISessionBackend[UUID, SessionData]
+    reads: int = 0
+    writes: int = 0
+    migrated: int = 0
+
+    def stats(self) -> ShardStats:
+        return ShardStats(
+            name=self.name,
+            reads=self.reads,
+            writes=self.writes,
+            migrated=self.migrated,
+            pool=self.pool.stats(),
+        )
+
+
+class ShardedSessionBackend(ISessionBackend[UUID, SessionData]):
+    """
+    Spreads sessions over several standalone Redis nodes by consistent
+    hashing of the session UUID. Each shard has its own connection
+    pool and a regular session backend; the per-user index and the
+    promoted guest data live on the shard of each session, so
+    user-wide operations fan out to every shard.
+
+    While `previous` names the ring being replaced, a session missing
+    from its new shard is moved over from its old one on first access,
+    and `start` runs a throttled background pass moving the rest.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        config: RedisConfig,
+        shards: Iterable[SessionShard],
+        ring: HashRing,
+        previous: Optional[HashRing] = None
+    ) -> None:
+        self._redis = redis
+        self._config = config
+        self._shards = {shard.name: shard for shard in shards}
+        self._ring = ring
+        self._previous = previous
+        self._migrator: Optional[asyncio.Task] = None
+        self._claim_script = redis.register_script(_CLAIM_SCRIPT)
+
+    def parse_cookie(self, value: str) -> Optional[UUID]:
+        try:
+            return UUID(value)
+        except ValueError:
+            return None
+
+    def cookie_value(self, session_id: UUID) -> str:
+        return str(session_id)
+
+    async def create(self, session_id: UUID, data: SessionData) -> UUID:
+        shard = self._target(session_id)
+        shard.writes += 1
+        return await shard.backend.create(session_id, data)
+
+    async def read(self, session_id: UUID) -> Optional[SessionData]:
+        """Reads a session from its shard, moving it there if needed."""
+        shard = self._target(session_id)
+        shard.reads += 1
+        data = await shard.backend.read(session_id)
+        if data is None and await self._settle(session_id):
+            data = await shard.backend.read(session_id)
+        return data
+
+    async def update(self, session_id: UUID, data: SessionData) -> UUID:
+        await self._settle(session_id)
+        shard = self._target(session_id)
+        shard.writes += 1
+        return await shard.backend.update(session_id, data)
+
+    async def patch(self, session_id: UUID, **fields: Any) -> UUID:
+        await self._settle(session_id)
+        shard = self._target(session_id)
+        shard.writes += 1
+        return await shard.backend.patch(session_id, **fields)
+
+    async def delete(self, session_id: UUID) -> None:
+        await self.delete_many([session_id])
+
+    async def read_many(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        """Reads sessions with one batch per shard, in parallel."""
+        session_ids = list(session_ids)
+        sessions = await self._read_grouped(session_ids)
+        moved = [
+            session_id for session_id in session_ids
+            if session_id not in sessions and self._source(session_id)
+        ]
+        if moved:
+            settled = await asyncio.gather(*map(self._settle, moved))
+            sessions.update(await self._read_grouped(
+                session_id for session_id, ok in zip(moved, settled) if ok
+            ))
+        return sessions
+
+    async def delete_many(self, session_ids: Iterable[UUID]) -> None:
+        """Deletes sessions from their current and previous shards."""
+        groups: dict[str, list[UUID]] = defaultdict(list)
+        for session_id in session_ids:
+            groups[self._target(session_id).name].append(session_id)
+            if source := self._source(session_id):
+                groups[source.name].append(session_id)
+        await asyncio.gather(*(
+            self._shards[name].backend.delete_many(group)
+            for name, group in groups.items()
+        ))
+
+    async def revoke_user(self, user_id: int) -> list[UUID]:
+        """Deletes every indexed session of a user on all shards."""
+        index_key = user_sessions_key(user_id)
+        members = await asyncio.gather(*(
+            cast(Awaitable[set[bytes]], shard.redis.smembers(index_key))
+            for shard in self._shards.values()
+        ))
+        revoked = [
+            UUID(hex=member.decode())
+            for member in set().union(*members)
+        ]
+        await self.delete_many(revoked)
+        await asyncio.gather(*(
+            shard.redis.delete(index_key) for shard in self._shards.values()
+        ))
+        return revoked
+
+    async def promote(
+        self,
+        data: SessionData,
+        guest_id: Optional[UUID] = None,
+        previous_id: Optional[UUID] = None
+    ) -> UUID:
+        """
+        Starts the session on a randomly chosen shard, then copies the
+        guest data there before deleting it and the previous session.
+        Unlike the single-node backend these steps are not one atomic
+        script.
+        """
+        shard = self._shards[self._ring.node(uuid4())]
+        shard.writes += 1
+        session_id = await shard.backend.promote(data)
+        if guest_id:
+            guest_key = guest_data_key(guest_id)
+            guest = await cast(
+                Awaitable[dict[bytes, bytes]], self._redis.hgetall(guest_key)
+            )
+            if guest:
+                async with shard.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(user_data_key(data.user_id), mapping=guest)
+                    pipe.expire(
+                        user_data_key(data.user_id),
+                        self._config.session_absolute_ttl
+                    )
+                    await pipe.execute()
+            await self._redis.delete(guest_key)
+        if previous_id and previous_id != session_id:
+            await self.delete(previous_id)
+        return session_id
+
+    async def read_user_data(self, user_id: int) -> dict[str, Any]:
+        """Merges the user data stored on every shard."""
+        merged: dict[str, Any] = {}
+        for data in await asyncio.gather(*(
+            shard.backend.read_user_data(user_id)
+            for shard in self._shards.values()
+        )):
+            merged.update(data)
+        return merged
+
+    async def update_user_data(self, user_id: int, fields: dict[str, Any]) -> None:
+        """
+        Writes the fields to the user data on every shard, so the copies
+        merged by `read_user_data` agree.
+        """
+        await asyncio.gather(*(
+            shard.backend.update_user_data(user_id, fields)
+            for shard in self._shards.values()
+        ))
+
+    def stats(self) -> list[ShardStats]:
+        """Returns per-shard operation counters and pool usage."""
+        return [shard.stats() for shard in self._shards.values()]
+
+    async def start(self) -> None:
+        """Starts moving sessions off the previous ring, if any."""
+        if self._previous is not None:
+            self._migrator = asyncio.create_task(self._migrate(self._previous))
+
+    async def stop(self) -> None:
+        """Stops the migration and closes every shard pool."""
+        if self._migrator:
+            self._migrator.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._migrator
+            self._migrator = None
+        for shard in self._shards.values():
+            await shard.pool.aclose()
+
+    def _target(self, session_id: UUID) -> SessionShard:
+        return self._shards[self._ring.node(session_id)]
+
+    def _source(self, session_id: UUID) -> Optional[SessionShard]:
+        """Previous shard of a session if resharding moves it."""
+        if self._previous is None:
+            return None
+        name = self._previous.node(session_id)
+        if name == self._ring.node(session_id):
+            return None
+        return self._shards[name]
+
+    async def _read_grouped(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        groups: dict[str, list[UUID]] = defaultdict(list)
+        for session_id in session_ids:
+            groups[self._target(session_id).name].append(session_id)
+        sessions = {}
+        for name, group in groups.items():
+            self._shards[name].reads += len(group)
+        for result in await asyncio.gather(*(
+            self._shards[name].backend.read_many(group)
+            for name, group in groups.items()
+        )):
+            sessions.update(result)
+        return sessions
+
+    async def _settle(self, session_id: UUID) -> bool:
+        """Moves a session to its shard; returns whether it was moved."""
+        source = self._source(session_id)
+        if source is None:
+            return False
+        return await self._move(session_id, source, self._target(session_id))
+
+    async def _move(
+        self,
+        session_id: UUID,
+        source: SessionShard,
+        target: SessionShard
+    ) -> bool:
+        """
+        Moves a session key with DUMP/RESTORE, keeping its TTL, together
+        with its entry in the user's index and the user's data. The
+        source key is deleted first and only if it is unchanged, so a
+        session deleted meanwhile is not restored. A copy already on
+        the target wins.
+        """
+        key = session_id.hex
+        sessions = await source.backend.read_many([session_id])
+        if (data := sessions.get(session_id)) is None:
+            return False
+        index_key = user_sessions_key(data.user_id)
+        data_key = user_data_key(data.user_id)
+        async with source.redis.pipeline(transaction=True) as pipe:
+            pipe.dump(key)
+            pipe.pttl(key)
+            pipe.hgetall(data_key)
+            dumped, ttl, user_data = await pipe.execute()
+        if dumped is None:
+            return False
+        claimed = await self._claim_script(
+            keys=[key, index_key], args=[dumped, key], client=source.redis
+        )
+        if not claimed:
+            return False
+        async with target.redis.pipeline(transaction=True) as pipe:
+            pipe.restore(key, max(ttl, 0), dumped)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, self._config.session_absolute_ttl)
+            for field, value in user_data.items():
+                pipe.hsetnx(data_key, field, value)
+            if user_data:
+                pipe.expire(data_key, self._config.session_absolute_ttl)
+            try:
+                await pipe.execute()
+            except ResponseError as e:
+                if "BUSYKEY" not in str(e):
+                    raise
+            except (ConnectionError, TimeoutError, OSError):
+                # Put the session back so the next pass can retry it.
+                with contextlib.suppress(ResponseError):
+                    await source.redis.restore(key, max(ttl, 0), dumped)
+                raise
+        target.migrated += 1
+        return True
+
+    async def _migrate(self, previous: HashRing) -> None:
+        while True:
+            try:
+                moved = await self._migrate_pass(previous)
+            except (ConnectionError, TimeoutError, OSError):
+                logger.warning("Session migration interrupted, retrying")
+                await asyncio.sleep(self._config.session_migration_interval)
+            else:
+                logger.info("Session migration finished: %d moved", moved)
+                return
+
+    async def _migrate_pass(self, previous: HashRing) -> int:
+        batch = self._config.session_migration_batch
+        moved = 0
+        for name in previous.nodes:
+            source = self._shards[name]
+            async for key in source.redis.scan_iter(match="?" * 32, count=batch):
+                try:
+                    session_id = UUID(hex=key.decode())
+                except ValueError:
+                    continue
+                target = self._target(session_id)
+                if target is source:
+                    continue
+                if await self._move(session_id, source, target):
+                    moved += 1
+                    if moved % batch == 0:
+                        await asyncio.sleep(
+                            self._config.session_migration_interval
+                        )
+        return moved
+
+
+def _shard_name(pool: MeteredConnectionPool) -> str:
+    kwargs = pool.connection_kwargs
+    return "{host}:{port}/{db}".format(
+        host=kwargs.get("host", "localhost"),
+        port=kwargs.get("port", 6379),
+        db=kwargs.get("db", 0),
+    )
+
+
+def new_sharded_session_backend(
+    redis: Redis,
+    redis_config: RedisConfig,
+    new_store: Callable[
+        [Redis, Callable[[], UUID]], ISessionBackend[UUID, SessionData]
+    ]
+) -> ShardedSessionBackend:
+    """
+    Opens a pool per shard URL and builds the backend of each shard
+    with `new_store`, which receives the shard client and a session ID
+    generator keeping promoted sessions on that shard.
+    """
+    pools: dict[str, MeteredConnectionPool] = {}
+    current: list[str] = []
+    previous: list[str] = []
+    for urls, names in (
+        (redis_config.session_shards, current),
+        (redis_config.session_previous_shards, previous),
+    ):
+        for url in urls:
+            pool = new_redis_pool_from_url(url, redis_config)
+            name = _shard_name(pool)
+            # A node listed in both rings shares the pool created first;
+            # the duplicate has not opened any connection yet.
+            pools.setdefault(name, pool)
+            names.append(name)
+    ring = HashRing(current, redis_config.session_shard_vnodes)
+    shards = []
+    for name, pool in pools.items():
+        shard_redis = new_redis_client(pool)
+        new_id = partial(ring.new_id, name) if name in ring.nodes else uuid4
+        shards.append(SessionShard(
+            name=name,
+            pool=pool,
+            redis=shard_redis,
+            backend=new_store(shard_redis, new_id),
+        ))
+    return ShardedSessionBackend(
+        redis=redis,
+        config=redis_config,
+        shards=shards,
+        ring=ring,
+        previous=(
+            HashRing(previous, redis_config.session_shard_vnodes)
+            if previous else None
+        ),
+    )
@@ -0,0 +1,350 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import math
+import time
+from dataclasses import replace
+from typing import Any, Awaitable, Iterable, Optional, cast
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, TimeoutError
+
+from backend.src.application.interfaces import ISessionBackend
+from backend.src.config import RedisConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.codecs import SessionTokenCodec, SignedSessionID
+from backend.src.infrastructure.repositories.sessions import (
+    PROMOTE_SCRIPT,
+    guest_data_key,
+    user_data_key,
+    user_sessions_key,
+)
+
+REVOKED_SESSIONS_KEY = "revoked_sessions"
+
+# KEYS[1] - per-user index set, KEYS[2] - revoked sessions zset;
+# ARGV[1] - score (expiry time) for the revoked entries. Moves every
+# indexed session to the revocation list and drops the index.
+_REVOKE_USER_SCRIPT = """
+local members = redis.call('SMEMBERS', KEYS[1])
+for _, member in ipairs(members) do
+    redis.call('ZADD', KEYS[2], ARGV[1], member)
+end
+redis.call('DEL', KEYS[1])
+return members
+"""
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over byte strings using double hashing."""
+
+    def __init__(self, capacity: int, fp_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self._size = max(
+            8, int(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, item: bytes) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: bytes) -> Iterable[int]:
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + index * second) % self._size
+            for index in range(self._hashes)
+        )
+
+
+class SignedSessionBackend(ISessionBackend[UUID, SessionData]):
+    """
+    Keeps sessions in the cookie itself as signed (optionally
+    encrypted) tokens, so reading a session does not touch Redis.
+
+    Revoked session IDs are kept in a Redis sorted set scored by the
+    token expiry. Every worker mirrors it into a bloom filter refreshed
+    every `session_revocation_refresh` seconds, and only asks Redis
+    when the filter reports a possible hit. A revocation made on
+    another worker therefore takes effect within one refresh interval.
+    Tokens cannot be changed in place: updates issue a new token with
+    the same creation time and revoke the old one, so the auth cookie
+    rotates. Tokens expire after the absolute TTL; sliding expiry does
+    not apply to them.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        config: RedisConfig,
+        codec: SessionTokenCodec[SessionData]
+    ) -> None:
+        self._redis = redis
+        self._config = config
+        self._codec = codec
+        self._revoked = self._new_filter()
+        self._revoked_locally: list[bytes] = []
+        self._promote_script = redis.register_script(PROMOTE_SCRIPT)
+        self._revoke_script = redis.register_script(_REVOKE_USER_SCRIPT)
+        self._refresher: Optional[asyncio.Task] = None
+
+    def parse_cookie(self, value: str) -> Optional[UUID]:
+        """Returns the session carried by a valid, unexpired token."""
+        session_id = self._codec.decode(value)
+        if session_id is None or self._expires_at(session_id) <= time.time():
+            return None
+        return session_id
+
+    def cookie_value(self, session_id: UUID) -> str:
+        if not isinstance(session_id, SignedSessionID):
+            raise TypeError("Session ID was not issued by a signed backend")
+        return self._codec.encode(session_id)
+
+    async def create(self, session_id: UUID, data: SessionData) -> UUID:
+        """Issues a token for a new session."""
+        return await self._issue(
+            SignedSessionID(session_id, data, int(time.time()))
+        )
+
+    async def read(self, session_id: UUID) -> Optional[SessionData]:
+        """Returns the data embedded in the token unless it was revoked."""
+        if not isinstance(session_id, SignedSessionID):
+            return None
+        if await self._is_revoked(session_id):
+            return None
+        return session_id.data
+
+    async def update(self, session_id: UUID, data: SessionData) -> UUID:
+        """Issues a token carrying the new data and revokes the old one."""
+        return await self._issue(
+            SignedSessionID(uuid4(), data, self._created(session_id)),
+            session_id
+        )
+
+    async def patch(self, session_id: UUID, **fields: Any) -> UUID:
+        """Re-issues a live session with the given fields changed."""
+        if data := await self.read(session_id):
+            return await self.update(session_id, replace(data, **fields))
+        return session_id
+
+    async def delete(self, session_id: UUID) -> None:
+        """Adds a session to the revocation list."""
+        await self.delete_many([session_id])
+
+    async def read_many(
+        self,
+        session_ids: Iterable[UUID]
+    ) -> dict[UUID, SessionData]:
+        """Returns the data of every token that was not revoked."""
+        signed = [
+            session_id for session_id in session_ids
+            if isinstance(session_id, SignedSessionID)
+        ]
+        suspects = [
+            session_id for session_id in signed
+            if session_id.bytes in self._revoked
+        ]
+        revoked = set()
+        if suspects:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for session_id in suspects:
+                    pipe.zscore(REVOKED_SESSIONS_KEY, session_id.hex)
+                scores = await pipe.execute()
+            revoked = {
+                session_id for session_id, score in zip(suspects, scores)
+                if score is not None
+            }
+        return {
+            session_id: session_id.data for session_id in signed
+            if session_id not in revoked
+        }
+
+    async def delete_many(self, session_ids: Iterable[UUID]) -> None:
+        """Revokes several sessions in one round-trip."""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(REVOKED_SESSIONS_KEY, {
+                session_id.hex: self._expires_at(session_id)
+                for session_id in session_ids
+            })
+            for session_id in session_ids:
+                if isinstance(session_id, SignedSessionID):
+                    pipe.srem(
+                        user_sessions_key(session_id.data.user_id),
+                        session_id.hex
+                    )
+            await pipe.execute()
+        for session_id in session_ids:
+            self._mark_revoked(session_id)
+
+    async def revoke_user(self, user_id: int) -> list[UUID]:
+        """Revokes every session issued to a user."""
+        members = await self._revoke_script(
+            keys=[user_sessions_key(user_id), REVOKED_SESSIONS_KEY],
+            args=[int(time.time()) + self._config.session_absolute_ttl]
+        )
+        revoked = [UUID(hex=member.decode()) for member in members]
+        for session_id in revoked:
+            self._mark_revoked(session_id)
+        return revoked
+
+    async def promote(
+        self,
+        data: SessionData,
+        guest_id: Optional[UUID] = None,
+        previous_id: Optional[UUID] = None
+    ) -> UUID:
+        """
+        Issues a token for a new session ID, moving guest data to the
+        user and revoking the previous session in the same round-trip.
+        """
+        created = int(time.time())
+        session_id = SignedSessionID(uuid4(), data, created)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            await self._promote_script(
+                keys=[
+                    session_id.hex,
+                    user_sessions_key(data.user_id),
+                    user_data_key(data.user_id),
+                    guest_data_key(guest_id) if guest_id else "",
+                    "",
+                ],
+                args=[
+                    "none",
+                    self._config.session_absolute_ttl,
+                    self._config.session_absolute_ttl,
+                    session_id.hex,
+                    created,
+                ],
+                client=pipe
+            )
+            if previous_id:
+                pipe.zadd(
+                    REVOKED_SESSIONS_KEY,
+                    {previous_id.hex: self._expires_at(previous_id)}
+                )
+            await pipe.execute()
+        if previous_id:
+            self._mark_revoked(previous_id)
+        return session_id
+
+    async def read_user_data(self, user_id: int) -> dict[str, Any]:
+        """Returns the data merged from the user's guest sessions."""
+        raw = await cast(
+            Awaitable[dict[bytes, bytes]],
+            self._redis.hgetall(user_data_key(user_id))
+        )
+        return {key.decode(): json.loads(value) for key, value in raw.items()}
+
+    async def update_user_data(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Merges fields into the user's data and restarts its TTL."""
+        if not fields:
+            return
+        key = user_data_key(user_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                field: json.dumps(value) for field, value in fields.items()
+            })
+            pipe.expire(key, self._config.session_absolute_ttl)
+            await pipe.execute()
+
+    async def start(self) -> None:
+        """Loads the revocation list and keeps it refreshed."""
+        with contextlib.suppress(ConnectionError, TimeoutError, OSError):
+            await self._refresh()
+        self._refresher = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        """Stops refreshing the revocation list."""
+        if self._refresher:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+
+    async def _issue(
+        self,
+        session_id: SignedSessionID[SessionData],
+        previous_id: Optional[UUID] = None
+    ) -> UUID:
+        """Indexes a new token, revoking the one it replaces."""
+        index_key = user_sessions_key(session_id.data.user_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(index_key, session_id.hex)
+            pipe.expire(index_key, self._config.session_absolute_ttl)
+            if previous_id:
+                pipe.zadd(
+                    REVOKED_SESSIONS_KEY,
+                    {previous_id.hex: self._expires_at(previous_id)}
+                )
+                previous_owner = (
+                    previous_id.data.user_id
+                    if isinstance(previous_id, SignedSessionID)
+                    else session_id.data.user_id
+                )
+                pipe.srem(user_sessions_key(previous_owner), previous_id.hex)
+            await pipe.execute()
+        if previous_id:
+            self._mark_revoked(previous_id)
+        return session_id
+
+    async def _is_revoked(self, session_id: UUID) -> bool:
+        if session_id.bytes not in self._revoked:
+            return False
+        score = await self._redis.zscore(REVOKED_SESSIONS_KEY, session_id.hex)
+        return score is not None
+
+    async def _refresh(self) -> None:
+        """Drops expired revocations and rebuilds the local filter."""
+        self._revoked_locally = []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(REVOKED_SESSIONS_KEY, "-inf", time.time())
+            pipe.zrange(REVOKED_SESSIONS_KEY, 0, -1)
+            _, members = await pipe.execute()
+        revoked = self._new_filter()
+        for member in members:
+            revoked.add(bytes.fromhex(member.decode()))
+        # Keep revocations made here while the list was being fetched.
+        for raw_id in self._revoked_locally:
+            revoked.add(raw_id)
+        self._revoked = revoked
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.session_revocation_refresh)
+            try:
+                await self._refresh()
+            except (ConnectionError, TimeoutError, OSError):
+                # Keep the last known list until Redis is reachable.
+                continue
+
+    def _mark_revoked(self, session_id: UUID) -> None:
+        self._revoked.add(session_id.bytes)
+        self._revoked_locally.append(session_id.bytes)
+
+    def _created(self, session_id: UUID) -> int:
+        if isinstance(session_id, SignedSessionID):
+            return session_id.created
+        return int(time.time())
+
+    def _expires_at(self, session_id: UUID) -> int:
+        return self._created(session_id) + self._config.session_absolute_ttl
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(
+            self._config.session_revocation_capacity,
+            self._config.session_revocation_fp_rate,
+        )
@@ -0,0 +1,81 @@
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from backend.src.application.exceptions import (
+    ServiceOverloadedException,
+    TooManyLoginAttemptsException,
+)
+from backend.src.application.interfaces import ILoginThrottle
+from backend.src.config import SecretConfig
+
+# KEYS - sliding-window sorted sets; ARGV[1] - window in ms,
+# ARGV[2] - attempt ID, ARGV[2 + i] - limit for KEYS[i]. Records the
+# attempt in every window, or nothing when any window is full, in
+# which case it returns the ms until the oldest attempt expires.
+_SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = now[1] * 1000 + math.floor(now[2] / 1000)
+local window = tonumber(ARGV[1])
+local retry = 0
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[i + 2]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry = math.max(retry, tonumber(oldest[2]) + window - now_ms, 1)
+    end
+end
+if retry > 0 then
+    return retry
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now_ms, ARGV[2])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+
+class RedisLoginThrottle(ILoginThrottle):
+    """
+    Sliding-window login limits per username and per client IP,
+    kept in Redis so they hold across workers, plus a per-process
+    cap on concurrent password verifications.
+    """
+
+    _KEY_PREFIX = "login_throttle:"
+
+    def __init__(self, redis: Redis, app_config: SecretConfig) -> None:
+        self._config = app_config
+        self._script = redis.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._in_flight = 0
+
+    async def hit(self, username: str, client_ip: str | None) -> None:
+        if not self._config.login_throttle_enabled:
+            return
+        keys = [f"{self._KEY_PREFIX}user:{username}"]
+        limits = [self._config.login_username_limit]
+        if client_ip:
+            keys.append(f"{self._KEY_PREFIX}ip:{client_ip}")
+            limits.append(self._config.login_ip_limit)
+        retry_ms = await self._script(
+            keys=keys,
+            args=[self._config.login_window * 1000, uuid4().hex, *limits]
+        )
+        if retry_ms:
+            raise TooManyLoginAttemptsException(
+                retry_after=math.ceil(int(retry_ms) / 1000)
+            )
+
+    @asynccontextmanager
+    async def verification(self) -> AsyncIterator[None]:
+        if self._in_flight >= self._config.login_max_concurrency:
+            raise ServiceOverloadedException()
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
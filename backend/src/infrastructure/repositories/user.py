@@ -1,7 +1,13 @@
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from backend.src.application.exceptions import UserNotFoundException
+from backend.src.application.exceptions import (
+    UserAlreadyExistsError,
+    UserNotFoundException,
+)
 from backend.src.application.interfaces import IUser
 from backend.src.domain.entities import UserDm, UserPasswordDM, UserSignupDM
 from backend.src.infrastructure.models import User
@@ -16,35 +22,70 @@ class UserRepo(IUser):
 
     async def get_password(self, username: str) -> UserPasswordDM:
         """Retrieves the hashed password of a user by their username."""
+        projection = User.projection(UserPasswordDM)
         result = await self._session.execute(
-            select(User).where(
+            projection.select().where(
                 User.username == username
             )
         )
-        if user := result.scalars().first():
-            return user.to_domain(UserPasswordDM)
+        if row := result.first():
+            return projection.map(row)
         raise UserNotFoundException()
 
     async def get_current_user(self, user_id: int) -> UserDm:
         """Fetches the current user's data by their user ID."""
-        if user := await self._session.get(User, user_id):
-            return user.to_domain(UserDm)
+        projection = User.projection(UserDm)
+        result = await self._session.execute(
+            projection.select().where(User.id == user_id)
+        )
+        if row := result.first():
+            return projection.map(row)
         raise UserNotFoundException()
 
     async def get_user_by_username(self, username: str) -> UserDm:
-        """Fetches the current user's data by their user ID."""
+        """Fetches the current user's data by their username."""
+        projection = User.projection(UserDm)
         result = await self._session.execute(
-            select(User).where(User.username == username)
+            projection.select().where(User.username == username)
         )
-        if user := result.scalars().first():
-            return user.to_domain(UserDm)
+        if row := result.first():
+            return projection.map(row)
         raise UserNotFoundException()
 
-    async def signup(self, signup_dm: UserSignupDM) -> None:
-        """Registers a new user in the system."""
-        model = User()
-        model.hashed_password = signup_dm.hashed_password
-        model.username = signup_dm.username
-        model.salt = signup_dm.salt
-        self._session.add(model)
+    async def signup(self, signup_dm: UserSignupDM) -> UserDm:
+        """
+        Registers a new user with a single INSERT ... RETURNING.
+        A taken username is reported by ON CONFLICT DO NOTHING
+        returning no row.
+        """
+        projection = User.projection(UserDm)
+        result = await self._session.execute(
+            insert(User)
+            .values(
+                username=signup_dm.username,
+                hashed_password=signup_dm.hashed_password,
+                salt=signup_dm.salt,
+            )
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(*projection.columns)
+        )
+        if row := result.first():
+            return projection.map(row)
+        raise UserAlreadyExistsError()
 
+    async def update_password(
+        self,
+        user_id: int,
+        old_hash: str,
+        new_hash: str
+    ) -> bool:
+        """
+        Swaps the password hash only if it was not changed meanwhile,
+        so a concurrent password change is never overwritten.
+        """
+        result = cast(CursorResult[Any], await self._session.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        ))
+        return result.rowcount == 1
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+
+from backend.src.application.interfaces import IUser
+from backend.src.config import CacheConfig
+from backend.src.domain.entities import UserDm, UserPasswordDM, UserSignupDM
+
+
+class UserCache:
+    """
+    Two-tier cache of `UserDm` keyed by ID and by username: an
+    in-process TTL/LRU tier and an optional shared Redis tier.
+    Concurrent misses for the same key are coalesced so only one
+    caller runs the loader.
+    """
+
+    _REDIS_PREFIX = "user_cache:"
+
+    def __init__(self, config: CacheConfig, redis: Optional[Redis]) -> None:
+        self._config = config
+        self._redis = redis
+        self._local: OrderedDict[str, tuple[float, UserDm]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[UserDm]] = {}
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[UserDm]]
+    ) -> UserDm:
+        """Returns a cached user or loads it once for all waiting callers."""
+        while True:
+            if (user := self._get_local(key)) is not None:
+                return user
+            if (inflight := self._inflight.get(key)) is None:
+                return await self._load(key, loader)
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leading request was cancelled; retry unless
+                # this request is being cancelled too.
+                task = asyncio.current_task()
+                if not inflight.cancelled() or (task and task.cancelling()):
+                    raise
+
+    async def invalidate(self, user: UserDm) -> None:
+        """Drops both keys of a user from every tier."""
+        keys = (self.id_key(user.id), self.username_key(user.username))
+        for key in keys:
+            self._local.pop(key, None)
+        if self._redis is not None:
+            await self._redis.delete(*(self._REDIS_PREFIX + key for key in keys))
+
+    @staticmethod
+    def id_key(user_id: int) -> str:
+        return f"id:{user_id}"
+
+    @staticmethod
+    def username_key(username: str) -> str:
+        return f"username:{username}"
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[UserDm]]
+    ) -> UserDm:
+        future: asyncio.Future[UserDm] = (
+            asyncio.get_running_loop().create_future()
+        )
+        # Mark the outcome as retrieved even when nobody else waited.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            user = await self._get_remote(key)
+            if user is None:
+                user = await loader()
+                await self._set_remote(user)
+            self._set_local(user)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(user)
+            return user
+        finally:
+            del self._inflight[key]
+
+    def _get_local(self, key: str) -> Optional[UserDm]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry[1]
+
+    def _set_local(self, user: UserDm) -> None:
+        expires_at = time.monotonic() + self._config.user_ttl
+        for key in (self.id_key(user.id), self.username_key(user.username)):
+            self._local[key] = (expires_at, user)
+            self._local.move_to_end(key)
+        while len(self._local) > self._config.user_max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> Optional[UserDm]:
+        if self._redis is None:
+            return None
+        raw = await self._redis.get(self._REDIS_PREFIX + key)
+        return UserDm(**json.loads(raw)) if raw else None
+
+    async def _set_remote(self, user: UserDm) -> None:
+        if self._redis is None:
+            return
+        value = json.dumps({"id": user.id, "username": user.username})
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in (self.id_key(user.id), self.username_key(user.username)):
+                pipe.set(
+                    self._REDIS_PREFIX + key,
+                    value,
+                    ex=self._config.user_redis_ttl
+                )
+            await pipe.execute()
+
+
+class CachedUserRepo(IUser):
+    """
+    `IUser` decorator that serves user lookups through `UserCache`.
+    Password lookups are never cached.
+    """
+
+    def __init__(self, user_repo: IUser, cache: UserCache) -> None:
+        self._user_repo = user_repo
+        self._cache = cache
+
+    async def get_password(self, username: str) -> UserPasswordDM:
+        return await self._user_repo.get_password(username)
+
+    async def signup(self, signup_dm: UserSignupDM) -> UserDm:
+        user = await self._user_repo.signup(signup_dm)
+        await self._cache.invalidate(user)
+        return user
+
+    async def update_password(
+        self,
+        user_id: int,
+        old_hash: str,
+        new_hash: str
+    ) -> bool:
+        return await self._user_repo.update_password(user_id, old_hash, new_hash)
+
+    async def get_current_user(self, user_id: int) -> UserDm:
+        return await self._cache.get_or_load(
+            UserCache.id_key(user_id),
+            lambda: self._user_repo.get_current_user(user_id)
+        )
+
+    async def get_user_by_username(self, username: str) -> UserDm:
+        return await self._cache.get_or_load(
+            UserCache.username_key(username),
+            lambda: self._user_repo.get_user_by_username(username)
+        )
@@ -0,0 +1,129 @@
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+
+_SQL_STARTED = "trace_started"
+
+Target = TypeVar("Target")
+
+
+class RequestTrace:
+    """Durations of the spans recorded while serving one request."""
+
+    __slots__ = ("started", "spans")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, elapsed: float) -> None:
+        if (entry := self.spans.get(name)) is None:
+            self.spans[name] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+
+    def server_timing(self) -> str:
+        """Renders the spans as a `Server-Timing` header value."""
+        metrics = [
+            f'{name};dur={total * 1000:.2f};desc="{count:.0f}"'
+            for name, (total, count) in self.spans.items()
+        ]
+        total = time.perf_counter() - self.started
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar(
+    "request_trace", default=None
+)
+
+
+def start_trace() -> RequestTrace:
+    """Starts collecting spans for the current request."""
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Adds the duration of the block to the current trace, if any."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - started)
+
+
+class Traced(Generic[Target]):
+    """
+    Proxy that records every awaited method of `target` as a span
+    named `name`; other attributes are passed through untouched.
+    """
+
+    def __init__(self, target: Target, name: str) -> None:
+        self._target = target
+        self._name = name
+        self._wrapped: dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, attr: str) -> Any:
+        if (wrapped := self._wrapped.get(attr)) is not None:
+            return wrapped
+        value = getattr(self._target, attr)
+        if not inspect.iscoroutinefunction(value):
+            return value
+
+        @wraps(value)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(self._name):
+                return await value(*args, **kwargs)
+
+        self._wrapped[attr] = wrapper
+        return wrapper
+
+
+def traced(target: Target, name: str) -> Target:
+    """Wraps `target` in `Traced`, keeping its static type."""
+    return cast(Target, Traced(target, name))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if _current_trace.get() is not None:
+        conn.info.setdefault(_SQL_STARTED, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info.get(_SQL_STARTED)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if (trace := _current_trace.get()) is not None:
+        trace.add("sql", elapsed)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its
+    # start time so the pooled connection's list does not grow.
+    conn = context.connection
+    if conn is not None and context.execution_context is not None:
+        if started := conn.info.get(_SQL_STARTED):
+            started.pop()
+
+
+def instrument_sqlalchemy() -> None:
+    """Records SQL statement time for every engine, replicas included."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
@@ -1,11 +1,20 @@
-from typing import AsyncIterable
-from uuid import uuid4
+import contextlib
+from typing import AsyncIterable, AsyncIterator, Callable
+from uuid import UUID, uuid4
 
 from argon2 import PasswordHasher
-from dishka import AnyOf, Provider, Scope, from_context, provide
+from dishka import (
+    AnyOf,
+    AsyncContainer,
+    Provider,
+    Scope,
+    decorate,
+    from_context,
+    provide,
+)
 from faststream.rabbit import RabbitBroker
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from backend.src.application import interfaces
 from backend.src.application.interactors import (
@@ -13,48 +22,220 @@ from backend.src.application.interactors import (
     LoginInteractor,
     SignupInteractor,
 )
-from backend.src.config import Config, SecretConfig
-from backend.src.infrastructure.factories.postgres import new_session_maker
-from backend.src.infrastructure.factories.redis import new_redis_client
+from backend.src.config import (
+    Config,
+    RedisConfig,
+    SecretConfig,
+    TracingConfig,
+)
+from backend.src.infrastructure.codecs import (
+    new_session_serializer,
+    new_session_token_codec,
+)
+from backend.src.infrastructure.factories.executor import BoundedExecutor
+from backend.src.infrastructure.factories.postgres import (
+    ReplicaRouter,
+    ReplicaSession,
+    new_replica_router,
+    new_session_maker,
+)
+from backend.src.infrastructure.factories.redis import (
+    MeteredConnectionPool,
+    new_redis_client,
+)
 from backend.src.infrastructure.repositories.cookies import CookieRepo
 from backend.src.infrastructure.repositories.exc import ExceptionHandlersRepo
 from backend.src.infrastructure.repositories.security import (
+    PasswordRehasher,
     SecurityRepo,
+    UserRepoFactory,
+)
+from backend.src.infrastructure.repositories.session_cache import (
+    CachedSessionBackend,
+    SessionCache,
 )
 from backend.src.infrastructure.repositories.sessions import (
     GuestSessionBackend,
+    RedisHashSessionBackend,
     RedisSessionBackend,
 )
+from backend.src.infrastructure.repositories.sharded_sessions import (
+    new_sharded_session_backend,
+)
+from backend.src.infrastructure.repositories.signed_sessions import (
+    SignedSessionBackend,
+)
+from backend.src.infrastructure.repositories.throttle import RedisLoginThrottle
 from backend.src.infrastructure.repositories.user import UserRepo
+from backend.src.infrastructure.repositories.user_cache import (
+    CachedUserRepo,
+    UserCache,
+)
+from backend.src.infrastructure.tracing import traced
 
 
 class AppProvider(Provider):
     config = from_context(provides=Config, scope=Scope.APP)
     broker = from_context(provides=RabbitBroker, scope=Scope.APP)
     password_hasher = from_context(provides=PasswordHasher, scope=Scope.APP)
+    hash_executor = from_context(provides=BoundedExecutor, scope=Scope.APP)
+    redis_pool = from_context(provides=MeteredConnectionPool, scope=Scope.APP)
+    engine = from_context(provides=AsyncEngine, scope=Scope.APP)
 
     @provide(scope=Scope.APP)
     def get_uuid_generator(self) -> interfaces.UUIDGenerator:
         return uuid4
 
+    @provide(scope=Scope.APP)
+    def get_redis_conn(self, pool: MeteredConnectionPool) -> Redis:
+        return new_redis_client(pool)
+
+    @provide(scope=Scope.APP)
+    async def get_session_backend(
+        self,
+        config: Config,
+        redis: Redis
+    ) -> AsyncIterable[interfaces.ISessionBackend]:
+        backend: interfaces.ISessionBackend
+        async with contextlib.AsyncExitStack() as stack:
+            if config.redis.session_storage == "signed":
+                signed = SignedSessionBackend(
+                    redis,
+                    config.redis,
+                    new_session_token_codec(config.secret, config.redis)
+                )
+                await signed.start()
+                stack.push_async_callback(signed.stop)
+                yield signed
+                return
+            if config.redis.session_shards:
+                sharded = new_sharded_session_backend(
+                    redis,
+                    config.redis,
+                    lambda shard, new_id: self._new_session_store(
+                        config.redis, shard, new_id
+                    )
+                )
+                await sharded.start()
+                stack.push_async_callback(sharded.stop)
+                backend = sharded
+            else:
+                backend = self._new_session_store(config.redis, redis)
+            if config.redis.session_cache_enabled:
+                cached = CachedSessionBackend(
+                    backend=backend,
+                    redis=redis,
+                    cache=SessionCache(
+                        ttl=config.redis.session_cache_ttl,
+                        max_entries=config.redis.session_cache_max_entries,
+                        max_bytes=config.redis.session_cache_max_bytes,
+                    ),
+                )
+                await cached.start()
+                stack.push_async_callback(cached.stop)
+                backend = cached
+            yield backend
+
+    @staticmethod
+    def _new_session_store(
+        redis_config: RedisConfig,
+        redis: Redis,
+        new_id: Callable[[], UUID] = uuid4
+    ) -> interfaces.ISessionBackend:
+        if redis_config.session_storage == "hash":
+            return RedisHashSessionBackend(redis, redis_config, new_id)
+        return RedisSessionBackend(
+            redis, redis_config, new_session_serializer(redis_config), new_id
+        )
+
+    @provide(scope=Scope.APP)
+    def get_user_cache(self, config: Config, redis: Redis) -> UserCache:
+        return UserCache(
+            config=config.cache,
+            redis=redis if config.cache.user_redis_enabled else None
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_cached_user_repo(
+        self,
+        config: Config,
+        user_repo: UserRepo,
+        cache: UserCache
+    ) -> interfaces.IUser:
+        if not config.cache.user_enabled:
+            return user_repo
+        return CachedUserRepo(user_repo, cache)
+
+    @provide(scope=Scope.APP)
+    async def get_replica_router(
+        self,
+        config: Config,
+        session_maker: async_sessionmaker[AsyncSession]
+    ) -> AsyncIterable[ReplicaRouter]:
+        router = new_replica_router(config.postgres, session_maker)
+        yield router
+        await router.dispose()
+
     @provide(scope=Scope.REQUEST)
-    async def get_redis_conn(self, config: Config) -> AsyncIterable[Redis]:
-        conn = await new_redis_client(config.redis)
-        try:
-            yield conn
-        finally:
-            await conn.aclose()
+    async def get_replica_session(
+        self,
+        router: ReplicaRouter
+    ) -> AsyncIterable[ReplicaSession]:
+        async with await router.session() as session:
+            yield ReplicaSession(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_user_reader(
+        self,
+        config: Config,
+        session: ReplicaSession,
+        cache: UserCache
+    ) -> interfaces.IUserReader:
+        return self.get_cached_user_repo(config, UserRepo(session), cache)
+
+    @provide(scope=Scope.APP)
+    def get_user_repo_factory(self, container: AsyncContainer) -> UserRepoFactory:
+        """
+        Opens `IUser` in a fresh request scope, so background work goes
+        through the same decorators (cache, tracing) as handlers do.
+        """
+        @contextlib.asynccontextmanager
+        async def open_user_repo() -> AsyncIterator[interfaces.IUser]:
+            async with container() as request_container:
+                yield await request_container.get(interfaces.IUser)
+                session = await request_container.get(interfaces.ISession)
+                await session.commit()
+
+        return open_user_repo
+
+    @provide(scope=Scope.APP)
+    async def get_password_rehasher(
+        self,
+        security: interfaces.ISecurity,
+        open_user_repo: UserRepoFactory
+    ) -> AsyncIterable[interfaces.IPasswordRehasher]:
+        rehasher = PasswordRehasher(security, open_user_repo)
+        yield rehasher
+        await rehasher.close()
 
     @provide(scope=Scope.APP)
     def get_secret_config(self, config: Config) -> SecretConfig:
         return config.secret
 
+    @provide(scope=Scope.APP)
+    def get_redis_config(self, config: Config) -> RedisConfig:
+        return config.redis
+
+    @provide(scope=Scope.APP)
+    def get_tracing_config(self, config: Config) -> TracingConfig:
+        return config.tracing
+
     @provide(scope=Scope.APP)
     def get_session_maker(
         self, 
-        config: Config
+        engine: AsyncEngine
     ) -> async_sessionmaker[AsyncSession]:
-        return new_session_maker(config.postgres)
+        return new_session_maker(engine)
 
     @provide(scope=Scope.REQUEST)
     async def get_session(
@@ -66,27 +247,28 @@ class AppProvider(Provider):
         async with session_maker() as session:
             yield session
 
+    # Stateless repositories: one instance for the whole application.
     for name, (provider, interface) in {
         "cookie_repo": (
-            CookieRepo, interfaces.ICookieBackend
+            CookieRepo, AnyOf[CookieRepo, interfaces.ICookieBackend]
         ),
         "error_handler_repo": (
             ExceptionHandlersRepo, interfaces.IErrorHandler
         ),
-        "session_backend": (
-            RedisSessionBackend, interfaces.ISessionBackend
-        ),
         "guest_session_backend": (
             GuestSessionBackend, interfaces.IGuestSessionBackend
         ),
         "security_repo": (
             SecurityRepo, interfaces.ISecurity
         ),
-        "user_repo": (
-            UserRepo, interfaces.IUser
+        "login_throttle": (
+            RedisLoginThrottle, interfaces.ILoginThrottle
         ),
     }.items():
-        vars()[name] = provide(provider, scope=Scope.REQUEST, provides=interface)
+        vars()[name] = provide(provider, scope=Scope.APP, provides=interface)
+
+    # Anything holding an `AsyncSession` lives for a single request.
+    user_repo = provide(UserRepo, scope=Scope.REQUEST)
 
     for name, interactor in {
         "signup": SignupInteractor,
@@ -94,3 +276,43 @@ class AppProvider(Provider):
         "get_user": GetUserInteractor,
     }.items():
         vars()[name] = provide(source=interactor, scope=Scope.REQUEST)
+
+
+class TracingProvider(Provider):
+    """Records the time spent in each backend as a request span."""
+
+    @decorate
+    def trace_user_repo(self, user_repo: interfaces.IUser) -> interfaces.IUser:
+        return traced(user_repo, "db")
+
+    @decorate
+    def trace_user_reader(
+        self,
+        user_repo: interfaces.IUserReader
+    ) -> interfaces.IUserReader:
+        return traced(user_repo, "db")
+
+    @decorate
+    def trace_security(self, security: interfaces.ISecurity) -> interfaces.ISecurity:
+        return traced(security, "argon2")
+
+    @decorate
+    def trace_login_throttle(
+        self,
+        throttle: interfaces.ILoginThrottle
+    ) -> interfaces.ILoginThrottle:
+        return traced(throttle, "redis")
+
+    @decorate
+    def trace_session_backend(
+        self,
+        backend: interfaces.ISessionBackend
+    ) -> interfaces.ISessionBackend:
+        return traced(backend, "redis")
+
+    @decorate
+    def trace_guest_session_backend(
+        self,
+        backend: interfaces.IGuestSessionBackend
+    ) -> interfaces.IGuestSessionBackend:
+        return traced(backend, "redis")
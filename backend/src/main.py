@@ -5,22 +5,43 @@ from argon2 import PasswordHasher
 from dishka import make_async_container
 from fastapi import FastAPI
 from faststream.rabbit import RabbitBroker
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from backend.src.config import Config
 from backend.src.fastapi_app import create_fastapi_app
 from backend.src.faststream_app import create_faststream_app
+from backend.src.infrastructure.factories.executor import (
+    BoundedExecutor,
+    new_hash_executor,
+)
+from backend.src.infrastructure.factories.postgres import new_engine
 from backend.src.infrastructure.factories.rabbit import new_broker
-from backend.src.ioc import AppProvider
+from backend.src.infrastructure.factories.redis import (
+    MeteredConnectionPool,
+    new_redis_pool,
+)
+from backend.src.infrastructure.factories.security import new_password_hasher
+from backend.src.infrastructure.tracing import instrument_sqlalchemy
+from backend.src.ioc import AppProvider, TracingProvider
 
 config = Config()
 broker = new_broker(config.rabbitmq)
-password_hasher = PasswordHasher()
+redis_pool = new_redis_pool(config.redis)
+engine = new_engine(config.postgres)
+password_hasher = new_password_hasher(config.secret)
+hash_executor = new_hash_executor(config.secret)
+if config.tracing.enabled:
+    instrument_sqlalchemy()
 container = make_async_container(
     AppProvider(),
+    *([TracingProvider()] if config.tracing.enabled else []),
     context={
         Config: config, 
         RabbitBroker: broker,
-        PasswordHasher: password_hasher
+        PasswordHasher: password_hasher,
+        BoundedExecutor: hash_executor,
+        MeteredConnectionPool: redis_pool,
+        AsyncEngine: engine,
     }
 )
 
@@ -33,6 +54,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     yield
     if faststream_app.broker:
         await faststream_app.broker.close()
+    await container.close()
+    await redis_pool.aclose()
+    await engine.dispose()
+    hash_executor.shutdown()
 
 
 async def main() -> FastAPI:
@@ -0,0 +1,63 @@
+import shutil
+import socket
+import subprocess
+import time
+from typing import Iterator
+
+import pytest
+from redis import Redis
+from redis.exceptions import ConnectionError
+
+REDIS_SERVER = shutil.which("redis-server")
+REDIS_NODES = 4
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout: float = 5.0) -> None:
+    client = Redis(host="127.0.0.1", port=port)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client.ping()
+            return
+        except ConnectionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+        finally:
+            client.close()
+
+
+@pytest.fixture
+def redis_urls() -> Iterator[list[str]]:
+    """Starts throwaway local redis-server nodes and yields their URLs."""
+    if REDIS_SERVER is None:
+        pytest.skip("redis-server is not installed")
+    processes = []
+    urls = []
+    try:
+        for _ in range(REDIS_NODES):
+            port = _free_port()
+            processes.append(subprocess.Popen(
+                [
+                    REDIS_SERVER,
+                    "--bind", "127.0.0.1",
+                    "--port", str(port),
+                    "--save", "",
+                    "--appendonly", "no",
+                ],
+                stdout=subprocess.DEVNULL,
+            ))
+            _wait_ready(port)
+            urls.append(f"redis://127.0.0.1:{port}/0")
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import time
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from backend.src.config import RedisConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.codecs import (
+    JsonSessionCodec,
+    SessionSerializer,
+    SessionTokenCodec,
+    SignedSessionID,
+)
+from backend.src.infrastructure.factories.redis import (
+    new_redis_client,
+    new_redis_pool_from_url,
+)
+from backend.src.infrastructure.repositories.signed_sessions import (
+    BloomFilter,
+    SignedSessionBackend,
+)
+
+SERIALIZER = SessionSerializer(
+    SessionData, JsonSessionCodec(SessionData), readers=[]
+)
+
+
+def _codec(*secrets: str, encrypt: bool = False) -> SessionTokenCodec:
+    return SessionTokenCodec(SERIALIZER, list(secrets), encrypt)
+
+
+def _session(user_id: int = 1) -> SignedSessionID[SessionData]:
+    return SignedSessionID(
+        uuid4(), SessionData(user_id=user_id), int(time.time())
+    )
+
+
+def _flip(token: str, index: int) -> str:
+    raw = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    raw[index] ^= 0x01
+    return base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+
+
+@pytest.fixture(params=[False, True], ids=["signed", "encrypted"])
+def encrypt(request) -> bool:
+    if request.param:
+        pytest.importorskip("cryptography")
+    return request.param
+
+
+def test_round_trip(encrypt):
+    codec = _codec("k1", encrypt=encrypt)
+    session = _session(user_id=42)
+    decoded = codec.decode(codec.encode(session))
+    assert decoded == session
+    assert decoded.data == SessionData(user_id=42)
+    assert decoded.created == session.created
+
+
+def test_encrypted_token_hides_payload():
+    pytest.importorskip("cryptography")
+    codec = _codec("k1", encrypt=True)
+    session = _session()
+    raw = base64.urlsafe_b64decode(codec.encode(session) + "==")
+    assert session.bytes not in raw
+    assert b"user_id" not in raw
+
+
+def test_tampered_token_is_rejected(encrypt):
+    codec = _codec("k1", encrypt=encrypt)
+    token = codec.encode(_session())
+    size = len(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    for index in range(size):
+        assert codec.decode(_flip(token, index)) is None
+
+
+@pytest.mark.parametrize("value", ["", "x", "!!!", "AAAA", "A" * 200])
+def test_malformed_token_is_rejected(encrypt, value):
+    assert _codec("k1", encrypt=encrypt).decode(value) is None
+
+
+def test_truncated_token_is_rejected(encrypt):
+    codec = _codec("k1", encrypt=encrypt)
+    token = codec.encode(_session())
+    for end in range(len(token) - 1):
+        assert codec.decode(token[:end]) is None
+
+
+def test_token_from_other_key_is_rejected(encrypt):
+    token = _codec("k1", encrypt=encrypt).encode(_session())
+    assert _codec("k2", encrypt=encrypt).decode(token) is None
+
+
+def test_rotated_key_still_accepts_old_tokens(encrypt):
+    old = _codec("k1", encrypt=encrypt)
+    rotated = _codec("k2", "k1", encrypt=encrypt)
+    session = _session()
+    assert rotated.decode(old.encode(session)) == session
+    new_token = rotated.encode(session)
+    assert old.decode(new_token) is None
+    assert _codec("k2", encrypt=encrypt).decode(new_token) == session
+
+
+def test_retired_key_is_rejected(encrypt):
+    token = _codec("k1", encrypt=encrypt).encode(_session())
+    assert _codec("k2", "k3", encrypt=encrypt).decode(token) is None
+
+
+def test_signed_token_is_rejected_when_encryption_is_on():
+    pytest.importorskip("cryptography")
+    token = _codec("k1").encode(_session())
+    assert _codec("k1", encrypt=True).decode(token) is None
+
+
+def test_codec_requires_a_key():
+    with pytest.raises(ValueError):
+        _codec()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+    items = [uuid4().bytes for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+    for _ in range(1000):
+        bloom.add(uuid4().bytes)
+    false_positives = sum(uuid4().bytes in bloom for _ in range(10_000))
+    assert false_positives < 300
+
+
+def test_revoked_token_is_rejected(redis_urls):
+    config = RedisConfig(
+        REDIS_HOST="127.0.0.1",
+        REDIS_PORT=6379,
+        REDIS_SESSIONS_DB=0,
+        REDIS_PASSWORD="",
+    )
+
+    async def scenario():
+        redis = new_redis_client(new_redis_pool_from_url(redis_urls[0], config))
+        first = SignedSessionBackend(redis, config, _codec("k1"))
+        other = SignedSessionBackend(redis, config, _codec("k1"))
+        session_id = await first.create(uuid4(), SessionData(user_id=5))
+        token = first.cookie_value(session_id)
+        assert await other.read(other.parse_cookie(token)) is not None
+
+        await first.delete(session_id)
+        assert await first.read(first.parse_cookie(token)) is None
+        # Another worker sees the revocation once its filter refreshes.
+        await other.start()
+        assert await other.read(other.parse_cookie(token)) is None
+        await other.stop()
+
+        kept = await first.create(uuid4(), SessionData(user_id=6))
+        assert await first.read(kept) == SessionData(user_id=6)
+        assert set(await first.revoke_user(6)) == {kept}
+        assert await first.read(kept) is None
+        await redis.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_expired_token_is_rejected():
+    codec = _codec("k1")
+    config = RedisConfig(
+        REDIS_HOST="127.0.0.1",
+        REDIS_PORT=6379,
+        REDIS_SESSIONS_DB=0,
+        REDIS_PASSWORD="",
+    )
+    # Expiry is checked before Redis is consulted; nothing connects.
+    backend = SignedSessionBackend(Redis(), config, codec)
+    expired = SignedSessionID(
+        uuid4(),
+        SessionData(user_id=1),
+        int(time.time()) - config.session_absolute_ttl - 1,
+    )
+    assert backend.parse_cookie(codec.encode(expired)) is None
@@ -0,0 +1,180 @@
+import asyncio
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from backend.src.config import RedisConfig
+from backend.src.domain.entities import SessionData
+from backend.src.infrastructure.codecs import new_session_serializer
+from backend.src.infrastructure.factories.redis import (
+    new_redis_client,
+    new_redis_pool_from_url,
+)
+from backend.src.infrastructure.repositories.sessions import (
+    RedisSessionBackend,
+    guest_data_key,
+    user_data_key,
+    user_sessions_key,
+)
+from backend.src.infrastructure.repositories.sharded_sessions import (
+    HashRing,
+    ShardedSessionBackend,
+    new_sharded_session_backend,
+)
+
+
+def _config(shards: list[str], previous: list[str] | None = None) -> RedisConfig:
+    config = RedisConfig(
+        REDIS_HOST="127.0.0.1",
+        REDIS_PORT=6379,
+        REDIS_SESSIONS_DB=0,
+        REDIS_PASSWORD="",
+    )
+    config.session_shards = shards
+    config.session_previous_shards = previous or []
+    config.session_migration_batch = 10
+    config.session_migration_interval = 0
+    return config
+
+
+def _backend(config: RedisConfig, main_url: str) -> ShardedSessionBackend:
+    serializer = new_session_serializer(config)
+    return new_sharded_session_backend(
+        new_redis_client(new_redis_pool_from_url(main_url, config)),
+        config,
+        lambda redis, new_id: RedisSessionBackend(
+            redis, config, serializer, new_id
+        ),
+    )
+
+
+def _shard(backend: ShardedSessionBackend, url: str):
+    port = url.rsplit(":", 1)[1].split("/")[0]
+    return next(
+        shard for shard in backend._shards.values()
+        if shard.name == f"127.0.0.1:{port}/0"
+    )
+
+
+def test_ring_is_deterministic():
+    first = HashRing(["a", "b", "c"], vnodes=64)
+    second = HashRing(["c", "a", "b"], vnodes=64)
+    session_ids = [uuid4() for _ in range(200)]
+    assert [first.node(i) for i in session_ids] == [
+        second.node(i) for i in session_ids
+    ]
+
+
+def test_ring_spreads_sessions():
+    ring = HashRing(["a", "b", "c"], vnodes=64)
+    counts = Counter(ring.node(uuid4()) for _ in range(3000))
+    assert set(counts) == {"a", "b", "c"}
+    assert min(counts.values()) > 600
+
+
+def test_adding_a_node_only_moves_sessions_to_it():
+    old = HashRing(["a", "b"], vnodes=64)
+    new = HashRing(["a", "b", "c"], vnodes=64)
+    session_ids = [uuid4() for _ in range(3000)]
+    moved = [i for i in session_ids if old.node(i) != new.node(i)]
+    assert all(new.node(i) == "c" for i in moved)
+    assert 600 < len(moved) < 1400
+
+
+def test_new_id_maps_to_node():
+    ring = HashRing(["a", "b", "c"], vnodes=64)
+    assert all(ring.node(ring.new_id("b")) == "b" for _ in range(50))
+    with pytest.raises(ValueError):
+        ring.new_id("d")
+
+
+def test_empty_ring_is_rejected():
+    with pytest.raises(ValueError):
+        HashRing([], vnodes=64)
+
+
+def test_promote_moves_guest_data_to_shard(redis_urls):
+    main_url, *shard_urls = redis_urls
+
+    async def scenario():
+        backend = _backend(_config(shard_urls), main_url)
+        guest_id = uuid4()
+        await backend._redis.hset(
+            guest_data_key(guest_id), mapping={"cart": "[1]"}
+        )
+        session_id = await backend.promote(SessionData(user_id=1), guest_id)
+        shard = backend._target(session_id)
+        assert await shard.redis.exists(session_id.hex)
+        assert await backend.read_user_data(1) == {"cart": [1]}
+        assert not await backend._redis.exists(guest_data_key(guest_id))
+        await backend.stop()
+
+    asyncio.run(scenario())
+
+
+def test_migration_moves_sessions_with_index_and_user_data(redis_urls):
+    main_url, *shard_urls = redis_urls
+
+    async def scenario():
+        before = _backend(_config(shard_urls[:2]), main_url)
+        guest_id = uuid4()
+        await before._redis.hset(
+            guest_data_key(guest_id), mapping={"cart": "[1]"}
+        )
+        session_ids = [
+            await before.promote(
+                SessionData(user_id=index % 3),
+                guest_id if index == 0 else None
+            )
+            for index in range(120)
+        ]
+        await before.stop()
+
+        after = _backend(
+            _config(shard_urls, previous=shard_urls[:2]), main_url
+        )
+        await after.start()
+        assert after._migrator is not None
+        await after._migrator
+        added = _shard(after, shard_urls[2])
+        assert added.migrated > 0
+        assert len(await after.read_many(session_ids)) == len(session_ids)
+        for session_id in session_ids:
+            target = after._target(session_id)
+            for shard in after._shards.values():
+                assert await shard.redis.exists(session_id.hex) == (
+                    shard is target
+                )
+        moved = {
+            key async for key in added.redis.scan_iter(match="?" * 32)
+        }
+        indexed = set().union(*[
+            await added.redis.smembers(user_sessions_key(user_id))
+            for user_id in range(3)
+        ])
+        assert moved == indexed
+        if any(i.hex.encode() in moved for i in session_ids[::3]):
+            assert await added.redis.exists(user_data_key(0))
+        await after.stop()
+
+    asyncio.run(scenario())
+
+
+def test_revoke_user_reaches_every_shard(redis_urls):
+    main_url, *shard_urls = redis_urls
+
+    async def scenario():
+        backend = _backend(_config(shard_urls), main_url)
+        owned = [
+            await backend.promote(SessionData(user_id=7)) for _ in range(30)
+        ]
+        other = await backend.promote(SessionData(user_id=8))
+        shards = {backend._target(session_id).name for session_id in owned}
+        assert len(shards) > 1
+        assert set(await backend.revoke_user(7)) == set(owned)
+        assert await backend.read_many(owned) == {}
+        assert await backend.read(other) == SessionData(user_id=8)
+        await backend.stop()
+
+    asyncio.run(scenario())